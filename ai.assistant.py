@@ -1,8 +1,9 @@
 import os
 from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
+from llm_clients import chat_openai
 from langchain.agents import initialize_agent, Tool
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
 
 # Load .env keys
 load_dotenv()
@@ -10,7 +11,7 @@ serp_api_key = os.getenv("SERP_API_KEY")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
 # Setup tools
-search = SerpAPIWrapper(serpapi_api_key=serp_api_key)
+search = CachedSearch(SerpAPIWrapper(serpapi_api_key=serp_api_key), "serpapi")
 tools = [
     Tool(
         name="Web Competitive Intelligence Search",
@@ -20,7 +21,7 @@ tools = [
 ]
 
 # Setup LLM
-llm = ChatOpenAI(temperature=0.3, model="gpt-4", openai_api_key=openai_api_key)
+llm = chat_openai("gpt-4", temperature=0.3, openai_api_key=openai_api_key)
 
 # Initialize agent
 agent = initialize_agent(tools=tools, llm=llm, agent="zero-shot-react-description", verbose=True)
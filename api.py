@@ -2,17 +2,29 @@
 
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
+from langgraph.graph.message import add_messages
+from langgraph.checkpoint.sqlite import SqliteSaver
 from typing import TypedDict, Annotated
-import operator
 from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage, ToolMessage
-from langchain_openai import ChatOpenAI
+from llm_clients import chat_openai
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.utilities import SerpAPIWrapper
 from langchain_core.tools import Tool
-from fastapi import FastAPI
+from context_window import ContextWindow
+from tool_runner import execute_tool_calls
+from search_cache import CachedSearch, cached_tool, search_cache, search_flight
+from quota import quota
+from thread_registry import ThreadRegistry
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import uvicorn
 import time
+import os
+import sqlite3
+import asyncio
+import weakref
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 load_dotenv()
@@ -20,28 +32,30 @@ load_dotenv()
 # Wrap SerpAPI as a LangChain Tool manually
 serp_tool = Tool(
     name="serp_search",
-    func=SerpAPIWrapper().run,
+    func=CachedSearch(SerpAPIWrapper(), "serpapi").run,
     description="Use this tool to perform web searches via SerpAPI."
 )
 
 # Initialize the Tavily search tool
-search_tool_tavily = TavilySearchResults(max_results=5)
+search_tool_tavily = cached_tool(TavilySearchResults(max_results=5), "tavily")
 
 # Agent state definition
 class AgentState(TypedDict):
-    messages: Annotated[list[AnyMessage], operator.add]
+    # add_messages gives every message an ID, so repeated messages can be recognised
+    messages: Annotated[list[AnyMessage], add_messages]
 
 # Agent class for business planning and market research
 class MarketResearchAgent:
-    def __init__(self, model, tools, system_prompt=""):
+    def __init__(self, model, tools, system_prompt="", checkpointer=None):
         self.system = system_prompt
+        self.context = ContextWindow()
         graph = StateGraph(AgentState)
         graph.add_node("llm", self.call_model)
         graph.add_node("action", self.execute_tools)
         graph.add_conditional_edges("llm", self.needs_tool, {True: "action", False: END})
         graph.add_edge("action", "llm")
         graph.set_entry_point("llm")
-        self.graph = graph.compile()
+        self.graph = graph.compile(checkpointer=checkpointer)
         self.tools = {t.name: t for t in tools}
         self.model = model.bind_tools(tools)
 
@@ -49,23 +63,23 @@ class MarketResearchAgent:
         return len(state['messages'][-1].tool_calls) > 0
 
     def call_model(self, state: AgentState):
-        messages = state['messages']
+        messages = self.context.prepare(state['messages'], self.system)
         if self.system:
             messages = [SystemMessage(content=self.system)] + messages
         response = self.model.invoke(messages)
+        self.context.report(response, self.context.total_tokens(messages))
         return {'messages': [response]}
 
+    def run_tool(self, call):
+        print(f"Calling: {call}")
+        if call['name'] not in self.tools:
+            return "Tool not found, please retry."
+        return self.tools[call['name']].invoke(call['args'])
+
     def execute_tools(self, state: AgentState):
         tool_calls = state['messages'][-1].tool_calls
-        results = []
-        for call in tool_calls:
-            print(f"Calling: {call}")
-            if call['name'] not in self.tools:
-                result = "Tool not found, please retry."
-            else:
-                result = self.tools[call['name']].invoke(call['args'])
-            results.append(ToolMessage(tool_call_id=call['id'], name=call['name'], content=str(result)))
-        return {'messages': results}
+        # Independent calls run concurrently; results keep the tool_calls order
+        return {'messages': execute_tool_calls(tool_calls, self.run_tool)}
 
 # System prompt for business planning
 system_prompt = """
@@ -77,22 +91,105 @@ For example:
 Only when you have enough information, say: 'Here is your market analysis summary.' and provide a clear market insight using online tools.
 """
 
+# Conversation threads: graph state is checkpointed per thread, so clients only send new messages
+THREADS_DB_PATH = os.getenv("THREADS_DB_PATH", os.path.join("bizai_cache", "threads.sqlite3"))
+THREAD_TTL = int(os.getenv("THREAD_TTL", str(7 * 24 * 3600)))
+thread_registry = ThreadRegistry(THREADS_DB_PATH, THREAD_TTL)
+checkpoint_conn = sqlite3.connect(THREADS_DB_PATH, timeout=30, check_same_thread=False)
+checkpoint_conn.execute("PRAGMA journal_mode=WAL")
+checkpointer = SqliteSaver(checkpoint_conn)
+
 # Initialize model and agent
-llm_model = ChatOpenAI(model="gpt-4")
-agent = MarketResearchAgent(llm_model, [search_tool_tavily, serp_tool], system_prompt=system_prompt)
+llm_model = chat_openai("gpt-4")
+agent = MarketResearchAgent(llm_model, [search_tool_tavily, serp_tool], system_prompt=system_prompt,
+                            checkpointer=checkpointer)
 
 # FastAPI setup
 app = FastAPI()
 
+# The graph runs synchronously, so each /analyze call is offloaded to this pool
+# instead of blocking the event loop; its size caps concurrent graph runs.
+ANALYZE_WORKERS = int(os.getenv("ANALYZE_WORKERS", "16"))
+analyze_pool = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS, thread_name_prefix="analyze")
+
 class UserMessage(BaseModel):
-    conversation: list[str]
+    # Messages new since the last call; the thread already holds the rest
+    conversation: list[str] = []
+    message: str | None = None
+    thread_id: str | None = None
+
+def thread_config(thread_id):
+    return {"configurable": {"thread_id": thread_id}}
+
+# One graph run per thread at a time, or two runs would both start from the
+# same checkpoint and one's messages would be lost. Per process: run a single
+# worker, or route each thread to the same one.
+thread_locks = weakref.WeakValueDictionary()
+
+def thread_lock(thread_id):
+    lock = thread_locks.get(thread_id)
+    if lock is None:
+        lock = thread_locks[thread_id] = asyncio.Lock()
+    return lock
+
+def expire_threads():
+    for thread_id in thread_registry.pop_expired():
+        checkpointer.delete_thread(thread_id)
 
 @app.post("/analyze")
 async def analyze_market(user_input: UserMessage):
-    conversation = [HumanMessage(content=msg) for msg in user_input.conversation]
-    result = agent.graph.invoke({"messages": conversation})
+    if user_input.thread_id:
+        thread_id = user_input.thread_id
+        if thread_registry.get(thread_id) is None:
+            raise HTTPException(status_code=404, detail="Thread not found or expired")
+    else:
+        expire_threads()
+        thread_id = thread_registry.create()
+
+    new_messages = list(user_input.conversation)
+    if user_input.message:
+        new_messages.append(user_input.message)
+    conversation = [HumanMessage(content=msg) for msg in new_messages]
+
+    loop = asyncio.get_running_loop()
+    async with thread_lock(thread_id):
+        result = await loop.run_in_executor(
+            analyze_pool,
+            partial(agent.graph.invoke, {"messages": conversation}, thread_config(thread_id))
+        )
+        thread_registry.touch(thread_id)
     last_response = result['messages'][-1].content
-    return {"response": last_response}
+    return {"response": last_response, "thread_id": thread_id}
+
+@app.get("/threads/{thread_id}")
+async def get_thread(thread_id: str):
+    thread = thread_registry.get(thread_id)
+    if thread is None:
+        raise HTTPException(status_code=404, detail="Thread not found or expired")
+    state = agent.graph.get_state(thread_config(thread_id))
+    messages = state.values.get("messages", []) if state else []
+    thread["messages"] = [
+        {"type": msg.type, "content": msg.content}
+        for msg in messages
+        if msg.type in ("human", "ai") and msg.content
+    ]
+    return thread
+
+@app.delete("/threads/{thread_id}")
+async def delete_thread(thread_id: str):
+    async with thread_lock(thread_id):
+        if not thread_registry.delete(thread_id):
+            raise HTTPException(status_code=404, detail="Thread not found")
+        checkpointer.delete_thread(thread_id)
+    return {"thread_id": thread_id, "status": "deleted"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"search": search_cache.stats(), "search_single_flight": search_flight.stats()}
+
+@app.get("/quota/stats")
+async def quota_stats():
+    return quota.stats()
 
 # CLI fallback to run locally for testing
 if __name__ == "__main__":
@@ -103,16 +200,15 @@ if __name__ == "__main__":
         print("\n🤖: Hello! I’m your AI business planning assistant.")
         print("     I’ll ask a few questions to help build your market research.")
         user_input = input("👤: ")
-        conversation = [HumanMessage(content=user_input)]
+        thread_id = thread_registry.create()
 
         while True:
-            result = agent.graph.invoke({"messages": conversation})
+            # The checkpointer keeps the history; only the new message is sent
+            result = agent.graph.invoke({"messages": [HumanMessage(content=user_input)]}, thread_config(thread_id))
             message = result['messages'][-1]
 
             print("\n🤖:", message.content)
             if "market analysis summary" in message.content.lower():
                 break
 
-            user_input = input("👤: ")
-            conversation.append(HumanMessage(content=user_input))
-            conversation.extend(result['messages'])
\ No newline at end of file
+            user_input = input("👤: ")
\ No newline at end of file
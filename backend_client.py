@@ -0,0 +1,62 @@
+import os
+import asyncio
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Chat backend the summarize services read from and write to
+CHAT_BACKEND_URL = os.getenv("CHAT_BACKEND_URL", "http://192.168.1.64:5000")
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "20"))
+BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "10"))
+BACKEND_RETRIES = int(os.getenv("BACKEND_RETRIES", "3"))
+BACKEND_BACKOFF = float(os.getenv("BACKEND_BACKOFF", "0.5"))
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class BackendClient:
+    """Shared async client for the chat backend, with keep-alive pooling and retries.
+
+    Create one per app (in the FastAPI lifespan) and close it on shutdown. Pass
+    `transport=httpx.ASGITransport(app=fake_backend.app)` to run against the
+    local stand-in backend.
+    """
+
+    def __init__(self, base_url=CHAT_BACKEND_URL, pool_size=BACKEND_POOL_SIZE, timeout=BACKEND_TIMEOUT,
+                 retries=BACKEND_RETRIES, backoff=BACKEND_BACKOFF, transport=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(timeout),
+            transport=transport,
+        )
+
+    async def request(self, method, path, **kwargs):
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.request(method, path, **kwargs)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                logger.warning("%s %s returned %s, retrying", method, path, response.status_code)
+            except httpx.TransportError as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning("%s %s failed (%s), retrying", method, path, e)
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def get_executive_summary(self, clerk_id, project_id):
+        return await self.request("GET", f"/api/v1/chats/{clerk_id}/{project_id}/executive_summary")
+
+    async def save_executive_summary(self, clerk_id, project_id, content):
+        return await self.request(
+            "PUT",
+            f"/api/v1/chats/save-type-summary/{clerk_id}/{project_id}/executive_summary",
+            json={"content": content},
+        )
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import httpx
+
+# api.py builds its clients at import time; dummy keys are enough because the
+# benchmark swaps the agent for a fake that never calls a provider.
+for key in ("OPENAI_API_KEY", "SERPAPI_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+
+import api
+from langchain_core.messages import AIMessage
+
+
+class FakeGraph:
+    """Blocks like a real GPT-4 + tool loop would, for a fixed time."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def invoke(self, state, config=None):
+        time.sleep(self.latency)
+        return {"messages": state["messages"] + [AIMessage(content="Here is your market analysis summary.")]}
+
+
+class FakeAgent:
+    def __init__(self, latency):
+        self.graph = FakeGraph(latency)
+
+
+async def timed_requests(client, count):
+    payload = {"conversation": ["Shoe shop in Indore for Gen-Z"]}
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(client.post("/analyze", json=payload) for _ in range(count)))
+    elapsed = time.perf_counter() - started
+    assert all(r.status_code == 200 for r in responses), [r.status_code for r in responses]
+    return elapsed
+
+
+async def main(concurrency, latency):
+    api.agent = FakeAgent(latency)
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        single = await timed_requests(client, 1)
+        many = await timed_requests(client, concurrency)
+
+    print(f"graph latency: {latency:.2f}s, workers: {api.ANALYZE_WORKERS}")
+    print(f"1 request:  {single:.2f}s")
+    print(f"{concurrency} requests: {many:.2f}s ({many / single:.2f}x one request)")
+    return many / single
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent /analyze benchmark against a fake graph")
+    parser.add_argument("-n", "--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per fake graph run")
+    args = parser.parse_args()
+    ratio = asyncio.run(main(args.concurrency, args.latency))
+    # Fail loudly if requests are being served one after another again
+    sys.exit(0 if ratio < 2 else 1)
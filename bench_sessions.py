@@ -0,0 +1,115 @@
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+
+from langchain.vectorstores import Chroma
+
+from embedding_backends import HashingEmbeddings
+from vector_registry import VectorStoreRegistry
+
+# Compares the shared multi-tenant collection with the old one-directory-per-session
+# layout: disk footprint and filtered query latency. Fully offline (hashing embeddings).
+# Usage: python bench_sessions.py --sessions 10000 --turns 5 --per-session-sample 200
+
+TOPICS = ["shoe shop", "bakery", "SaaS for HR", "eco clothing", "cafe", "gym", "salon", "bookstore"]
+CITIES = ["Indore", "Agra", "Pune", "Delhi", "Jaipur", "Surat"]
+
+BATCH_SIZE = 1000
+
+
+def fake_turn(rng, session_id, turn):
+    topic, city = rng.choice(TOPICS), rng.choice(CITIES)
+    return (f"User: ({session_id} turn {turn}) What is the market for a {topic} in {city}?\n"
+            f"Assistant: The {topic} market in {city} is growing; key competitors, pricing and CAGR follow.")
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50": statistics.median(ordered), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def bench_shared(root, sessions, turns, queries, rng):
+    registry = VectorStoreRegistry(persist_dir=os.path.join(root, "shared"), backend="hashing")
+    store = registry.store
+
+    texts, metadatas = [], []
+    for s in range(sessions):
+        for t in range(turns):
+            texts.append(fake_turn(rng, f"user{s}", t))
+            metadatas.append({"session_id": f"user{s}"})
+    for i in range(0, len(texts), BATCH_SIZE):
+        store.add_texts(texts[i:i + BATCH_SIZE], metadatas=metadatas[i:i + BATCH_SIZE])
+
+    latencies = []
+    for _ in range(queries):
+        view = registry.get(f"user{rng.randrange(sessions)}")
+        started = time.perf_counter()
+        view.similarity_search(f"market for a {rng.choice(TOPICS)}", k=5)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return dir_size(registry.persist_dir), latencies
+
+
+def bench_per_session(root, sessions, turns, queries, rng):
+    embeddings = HashingEmbeddings()
+    stores = []
+    for s in range(sessions):
+        persist_dir = os.path.join(root, "per_session", f"user{s}")
+        store = Chroma(persist_directory=persist_dir, embedding_function=embeddings)
+        store.add_texts([fake_turn(rng, f"user{s}", t) for t in range(turns)])
+        stores.append(persist_dir)
+
+    latencies = []
+    for _ in range(queries):
+        # Each query pays for opening that session's directory, as memory.py used to
+        started = time.perf_counter()
+        store = Chroma(persist_directory=rng.choice(stores), embedding_function=embeddings)
+        store.similarity_search(f"market for a {rng.choice(TOPICS)}", k=5)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return dir_size(os.path.join(root, "per_session")), latencies
+
+
+def report(name, sessions, measured_sessions, size, latencies):
+    scale = sessions / measured_sessions
+    stats = percentiles(latencies)
+    note = f" (measured on {measured_sessions}, scaled)" if scale != 1 else ""
+    print(f"{name:12} disk: {size * scale / 1e6:9.1f} MB{note}")
+    print(f"{'':12} query ms: p50 {stats['p50']:.1f}  p95 {stats['p95']:.1f}  p99 {stats['p99']:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared collection vs per-session directories")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--turns", type=int, default=5, help="stored turns per session")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--per-session-sample", type=int, default=200,
+                        help="sessions actually built for the per-directory layout; disk is scaled up")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    root = tempfile.mkdtemp(prefix="bench_sessions_")
+    try:
+        size, latencies = bench_shared(root, args.sessions, args.turns, args.queries, rng)
+        report("shared", args.sessions, args.sessions, size, latencies)
+
+        sample = min(args.sessions, args.per_session_sample)
+        size, latencies = bench_per_session(root, sample, args.turns, args.queries, rng)
+        report("per-session", args.sessions, sample, size, latencies)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
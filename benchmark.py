@@ -0,0 +1,351 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_providers import PROFILES, TOKEN_PROFILE, FakeRunner, LatencyProfile, recorder
+
+# Offline end-to-end benchmark: each entry point's core pipeline runs against
+# the stand-ins in fake_providers.py, so no quota is spent and runs repeat.
+# Reports per-stage and end-to-end p50/p95/p99 latency plus throughput.
+# Usage:
+#   python benchmark.py --profile fast -n 50 -c 8
+#   python benchmark.py --scenario web_search --json before.json
+#   python benchmark.py --compare before.json --tolerance 0.2   (exits 1 on a regression)
+
+SCENARIOS = ["research", "web_search", "memory", "analyze", "summarize_chunks", "summarize_and_save"]
+
+TOPICS = ["shoe shop", "bakery", "SaaS for HR teams", "eco clothing brand", "cafe", "gym", "salon", "bookstore"]
+CITIES = ["Indore", "Agra", "Pune", "Delhi", "Jaipur", "Surat"]
+
+
+def prepare_environment(workdir, use_quota):
+    """Points every cache and store at `workdir`; must run before the app modules are imported."""
+    for key in ("OPENAI_API_KEY", "SERPAPI_API_KEY", "TAVILY_API_KEY", "GOOGLE_API_KEY"):
+        os.environ.setdefault(key, "benchmark")
+    os.environ.update({
+        "LLM_CACHE_DIR": workdir,
+        "SEARCH_CACHE_PATH": os.path.join(workdir, "search_cache.sqlite3"),
+        "SUMMARY_STORE_PATH": os.path.join(workdir, "summary_store.sqlite3"),
+        "THREADS_DB_PATH": os.path.join(workdir, "threads.sqlite3"),
+        "SHARED_MEMORY_DIR": os.path.join(workdir, "shared_memory"),
+        "EMBEDDING_BACKEND": "hashing",
+        "EMBEDDING_CACHE_PATH": os.path.join(workdir, "embedding_cache.sqlite3"),
+        "QUOTA_DB_PATH": os.path.join(workdir, "quota.sqlite3"),
+        "QUOTA_ENABLED": "1" if use_quota else "0",
+    })
+
+
+def question(i, repeat):
+    if repeat:
+        return "What is the market for a shoe shop in Indore?"
+    return f"What is the market for a {TOPICS[i % len(TOPICS)]} in {CITIES[i % len(CITIES)]}? (request {i})"
+
+
+def fake_gemini(profile, kind):
+    from llm_cache import CachedGenerativeModel
+    from llm_clients import RetryingGenerativeModel
+    from fake_providers import FakeGenerativeModel
+
+    # Same layers as production: cache, single-flight, retries, quota
+    return CachedGenerativeModel(RetryingGenerativeModel(FakeGenerativeModel(profile, kind)))
+
+
+def fake_search(profile, provider):
+    from search_cache import CachedSearch
+    from fake_providers import FakeSearch
+
+    return CachedSearch(FakeSearch(profile, provider), provider)
+
+
+# Scenarios: each returns an async `request(i)` running one end-to-end request
+
+async def research_scenario(profile, args):
+    import report_stream
+    import research_pipeline
+
+    FakeRunner.profile = profile
+    FakeRunner.queries = args.research_queries
+    research_pipeline.Runner = FakeRunner
+    report_stream.Runner = FakeRunner
+
+    triage_agent = SimpleNamespace(name="Triage Agent", output_type=object)
+    research_agent = SimpleNamespace(name="Research Agent", output_type=None)
+    editor_agent = SimpleNamespace(name="Editor Agent", output_type=object)
+
+    # cometitve.run_research's own steps, timed through its progress hooks
+    async def request(i):
+        research = research_pipeline.ResearchRun(question(i, args.repeat_inputs))
+        marks = [time.perf_counter()]
+
+        def mark(stage):
+            marks.append(time.perf_counter())
+            recorder.record(stage, marks[-1] - marks[-2])
+
+        await research.run(
+            triage_agent, research_agent, editor_agent, lambda report: None,
+            on_plan=lambda plan: mark("stage:triage"),
+            on_summaries=lambda summaries: mark("stage:research")
+        )
+        mark("stage:editor")
+
+    return request
+
+
+async def web_search_scenario(profile, args):
+    import web_search
+
+    web_search.search = fake_search(profile, "serpapi")
+    web_search.gemini_model = fake_gemini(profile, "answer")
+    history = [
+        {"user": question(1000 + t, False), "bot": f"🤖 **BizAI:**\n\nEarlier answer {t} about pricing and competitors."}
+        for t in range(args.history)
+    ]
+
+    async def request(i):
+        await asyncio.to_thread(web_search.answer_turn, question(i, args.repeat_inputs), history)
+
+    return request
+
+
+async def memory_scenario(profile, args):
+    import vector_registry
+    from fake_providers import FakeEmbeddings
+
+    vector_registry.get_embedding_backend = lambda name: FakeEmbeddings(profile)
+    import memory
+
+    memory.search = fake_search(profile, "serpapi")
+    memory.gemini_model = fake_gemini(profile, "answer")
+
+    # Every session starts with some stored turns to recall
+    for s in range(args.sessions):
+        memory.get_vectorstore(f"user{s}").add_texts(
+            [f"User: {question(1000 + t, False)}\nAssistant: earlier answer {t}" for t in range(args.history)]
+        )
+
+    async def request(i):
+        session_id = f"user{i % args.sessions}"
+        await asyncio.to_thread(memory.answer_turn, session_id, session_id, question(i, args.repeat_inputs))
+
+    async def finish():
+        # Turns are written behind the response; time the backlog separately
+        with recorder.timed("stage:memory_write_flush"):
+            await asyncio.to_thread(memory.memory_writer.flush)
+
+    request.finish = finish
+    return request
+
+
+async def analyze_scenario(profile, args):
+    import httpx
+    from langchain_core.tools import Tool
+    from fake_providers import FakeChatModel
+    import api
+
+    tools = [
+        Tool(name="tavily_search_results_json", func=fake_search(profile, "tavily").run,
+             description="Search the web via Tavily."),
+        Tool(name="serp_search", func=fake_search(profile, "serpapi").run,
+             description="Use this tool to perform web searches via SerpAPI."),
+    ]
+    api.agent = api.MarketResearchAgent(FakeChatModel(profile), tools, system_prompt=api.system_prompt,
+                                        checkpointer=api.checkpointer)
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=None)
+
+    async def request(i):
+        response = await client.post("/analyze", json={"conversation": [question(i, args.repeat_inputs)]})
+        assert response.status_code == 200, response.text
+
+    request.finish = client.aclose
+    return request
+
+
+async def summarize_scenario(profile, args, module_name):
+    import httpx
+    import importlib
+    import fake_backend
+    from backend_client import BackendClient
+
+    class TimedBackendClient(BackendClient):
+        async def request(self, method, path, **kwargs):
+            with recorder.timed("backend"):
+                return await super().request(method, path, **kwargs)
+
+    service = importlib.import_module(module_name)
+    fake_backend.FAKE_BACKEND_LATENCY = profile.backend
+    service.gemini_model = fake_gemini(profile, "summary")
+    # The lifespan does not run under ASGITransport, so set up what it would
+    service.app.state.backend = TimedBackendClient(transport=httpx.ASGITransport(app=fake_backend.app))
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=service.app), base_url="http://bench", timeout=None)
+
+    def project(i):
+        return "p0" if args.repeat_inputs else f"p{i}"
+
+    # Distinct chats per project, or every chunk prompt would be an LLM cache hit
+    for i in range(args.requests + args.warmup):
+        fake_backend.seed_chat("bench", project(i), [
+            {"isUser": m % 2 == 0, "content": f"{question(i, False)} message {m}"}
+            for m in range(args.messages)
+        ])
+
+    async def request(i):
+        if module_name == "s":
+            response = await client.get(f"/summarize_chunks/bench/{project(i)}")
+        else:
+            response = await client.put(f"/summarize_and_save/bench/{project(i)}")
+        body = response.json()
+        assert response.status_code == 200 and "error" not in body, body
+
+    async def finish():
+        await client.aclose()
+        await service.app.state.backend.aclose()
+
+    request.finish = finish
+    return request
+
+
+SCENARIO_SETUP = {
+    "research": research_scenario,
+    "web_search": web_search_scenario,
+    "memory": memory_scenario,
+    "analyze": analyze_scenario,
+    "summarize_chunks": lambda profile, args: summarize_scenario(profile, args, "s"),
+    "summarize_and_save": lambda profile, args: summarize_scenario(profile, args, "summarize"),
+}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"n": len(ordered), "p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+async def run_load(request, indexes, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            started = time.perf_counter()
+            await request(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in indexes))
+    return latencies, time.perf_counter() - started
+
+
+async def run_scenario(name, profile, args):
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=max(8, args.concurrency)))
+    # The pipelines print prompt sizes and tool calls; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        request = await SCENARIO_SETUP[name](profile, args)
+        await run_load(request, range(args.requests, args.requests + args.warmup), args.concurrency)
+        recorder.reset()
+        latencies, wall = await run_load(request, range(args.requests), args.concurrency)
+        if hasattr(request, "finish"):
+            await request.finish()
+
+    stages = {"end-to-end": percentiles(latencies)}
+    stages.update({stage: percentiles(samples) for stage, samples in sorted(recorder.samples.items())})
+    return {"throughput": len(latencies) / wall, "wall": wall, "stages": stages}
+
+
+def print_result(name, result, args):
+    print(f"\n{name}  ({args.requests} requests, concurrency {args.concurrency}, profile {args.profile})")
+    print(f"  {'stage':28} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:28} {stats['n']:6d} {stats['p50'] * 1000:10.1f} "
+              f"{stats['p95'] * 1000:10.1f} {stats['p99'] * 1000:10.1f}")
+    print(f"  throughput: {result['throughput']:.2f} req/s ({result['wall']:.2f}s wall)")
+
+
+def compare(results, baseline_path, tolerance):
+    """Names of scenarios whose end-to-end p95 or throughput got worse than `tolerance` allows."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["scenarios"]
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name], result
+        p95_before = before["stages"]["end-to-end"]["p95"]
+        p95_after = after["stages"]["end-to-end"]["p95"]
+        print(f"{name:20} p95 {p95_before * 1000:.1f} → {p95_after * 1000:.1f} ms, "
+              f"throughput {before['throughput']:.2f} → {after['throughput']:.2f} req/s")
+        if p95_after > p95_before * (1 + tolerance) or after["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def parse_overrides(values):
+    overrides = {}
+    for item in values or []:
+        key, _, value = item.partition("=")
+        overrides[key.strip()] = int(value) if value.strip().isdigit() else float(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmark against fake providers")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only this one (repeatable)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--set", action="append", metavar="KEY=SECONDS",
+                        help=f"override a latency setting: {', '.join(PROFILES['fast'])}")
+    parser.add_argument("--tokens", action="append", metavar="KIND=TOKENS",
+                        help=f"override generated tokens per call: {', '.join(TOKEN_PROFILE)}")
+    parser.add_argument("-n", "--requests", type=int, default=30)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured requests run first")
+    parser.add_argument("--repeat-inputs", action="store_true",
+                        help="send the same input every time (exercises caches and single-flight)")
+    parser.add_argument("--history", type=int, default=6, help="earlier turns per chat")
+    parser.add_argument("--sessions", type=int, default=20, help="memory sessions to spread turns over")
+    parser.add_argument("--messages", type=int, default=20, help="chat messages per summarized project")
+    parser.add_argument("--research-queries", type=int, default=4, help="queries in each research plan")
+    parser.add_argument("--quota", action="store_true", help="run with the cross-process quota scheduler on")
+    parser.add_argument("--json", help="write the results here")
+    parser.add_argument("--compare", help="earlier --json output to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    profile = LatencyProfile(args.profile, tokens=parse_overrides(args.tokens), **parse_overrides(args.set))
+    workdir = tempfile.mkdtemp(prefix="bizai_bench_")
+    prepare_environment(workdir, args.quota)
+
+    results = {}
+    try:
+        for name in args.scenario or SCENARIOS:
+            try:
+                results[name] = asyncio.run(run_scenario(name, profile, args))
+            except ImportError as e:
+                print(f"\n{name}: skipped, missing dependency ({e})")
+                continue
+            print_result(name, results[name], args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"profile": args.profile, "requests": args.requests, "concurrency": args.concurrency,
+                       "scenarios": results}, f, indent=2)
+    if args.compare:
+        print()
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,6 @@ from dotenv import load_dotenv
 
 from agents import (
     Agent, 
-    Runner, 
     WebSearchTool, 
     function_tool, 
     handoff, 
@@ -16,6 +15,10 @@ from agents import (
 
 from pydantic import BaseModel
 
+from fact_stream import publish_fact, run_with_fact_stream
+from research_pipeline import ResearchRun
+from llm_clients import with_agents_client
+
 # Load environment variables
 load_dotenv()
 
@@ -68,11 +71,13 @@ def save_important_fact(fact: str, source: str = None) -> str:
     if "collected_facts" not in st.session_state:
         st.session_state.collected_facts = []
     
-    st.session_state.collected_facts.append({
+    saved_fact = {
         "fact": fact,
         "source": source or "Not specified",
         "timestamp": datetime.now().strftime("%H:%M:%S")
-    })
+    }
+    st.session_state.collected_facts.append(saved_fact)
+    publish_fact(saved_fact)
     
     return f"Fact saved: {fact}"
 
@@ -150,7 +155,6 @@ triage_agent = Agent(
     - Use the Editor Agent for general research tasks
     """,
     handoffs=[
-        handoff(research_agent),
         handoff(competitive_analysis_agent),  # added here
         handoff(editor_agent)
     ],
@@ -194,7 +198,7 @@ if "report_result" not in st.session_state:
     st.session_state.report_result = None
 
 # Main research function
-async def run_research(topic):
+async def run_research(topic, run_config=None):
     # Reset state for new research
     st.session_state.collected_facts = []
     st.session_state.research_done = False
@@ -202,6 +206,10 @@ async def run_research(topic):
     
     with tab1:
         message_container = st.container()
+
+    # Live view of the report body while the editor agent is still writing
+    with tab2:
+        report_placeholder = st.empty()
         
     # Create error handling container
     error_container = st.empty()
@@ -211,58 +219,53 @@ async def run_research(topic):
         # Start with the triage agent
         with message_container:
             st.write("🔍 **Triage Agent**: Planning research approach...")
-        
-        triage_result = await Runner.run(
-            triage_agent,
-            f"Research this topic thoroughly: {topic}. This research will be used to create a comprehensive research report."
-        )
-        
-        # Check if the result is a ResearchPlan object or a string
-        if hasattr(triage_result.final_output, 'topic'):
-            research_plan = triage_result.final_output
+
+        research = ResearchRun(topic, plan_type=ResearchPlan)
+        # Display facts as they're collected, until the research phase finishes
+        fact_placeholder = None
+
+        def show_plan(research_plan):
+            nonlocal fact_placeholder
             plan_display = {
                 "topic": research_plan.topic,
                 "search_queries": research_plan.search_queries,
                 "focus_areas": research_plan.focus_areas
             }
-        else:
-            # Fallback if we don't get the expected output type
-            research_plan = {
-                "topic": topic,
-                "search_queries": ["Researching " + topic],
-                "focus_areas": ["General information about " + topic]
-            }
-            plan_display = research_plan
-        
-        with message_container:
-            st.write("📋 **Research Plan**:")
-            st.json(plan_display)
-        
-        # Display facts as they're collected
-        fact_placeholder = message_container.empty()
-        
-        # Check for new facts periodically
-        previous_fact_count = 0
-        for i in range(15):  # Check more times to allow for more comprehensive research
-            current_facts = len(st.session_state.collected_facts)
-            if current_facts > previous_fact_count:
-                with fact_placeholder.container():
-                    st.write("📚 **Collected Facts**:")
-                    for fact in st.session_state.collected_facts:
-                        st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
-                previous_fact_count = current_facts
-            await asyncio.sleep(1)
-        
-        # Editor Agent phase
-        with message_container:
-            st.write("📝 **Editor Agent**: Creating comprehensive research report...")
-        
+
+            with message_container:
+                st.write("📋 **Research Plan**:")
+                st.json(plan_display)
+
+            # Research every planned query at the same time
+            with message_container:
+                st.write(f"🔎 **Research Agent**: Researching {len(research_plan.search_queries)} queries in parallel...")
+            fact_placeholder = message_container.empty()
+
+        def show_fact(new_fact):
+            with fact_placeholder.container():
+                st.write("📚 **Collected Facts**:")
+                for fact in st.session_state.collected_facts:
+                    st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
+
+        def show_summaries(summaries):
+            with message_container:
+                with st.expander("🗂️ Research Summaries"):
+                    for item in summaries:
+                        st.markdown(f"**{item['query']}**\n\n{item['summary']}")
+
+            # Editor Agent phase
+            with message_container:
+                st.write("📝 **Editor Agent**: Creating comprehensive research report...")
+
         try:
-            report_result = await Runner.run(
-                editor_agent,
-                triage_result.to_input_list()
+            report_result = await research.run(
+                triage_agent, research_agent, editor_agent, report_placeholder.markdown,
+                on_plan=show_plan,
+                watch_research=lambda research_step: run_with_fact_stream(research_step, show_fact),
+                on_summaries=show_summaries,
+                run_config=run_config
             )
-            
+
             st.session_state.report_result = report_result.final_output
             
             with message_container:
@@ -279,10 +282,20 @@ async def run_research(topic):
                 st.write("*See the Report tab for the full document.*")
                 
         except Exception as e:
+            if research.summaries is None:
+                # Triage or research failed: the caller's error handling takes over
+                raise
             st.error(f"Error generating report: {str(e)}")
             # Fallback to display raw agent response
-            if hasattr(triage_result, 'new_items'):
-                messages = [item for item in triage_result.new_items if hasattr(item, 'content')]
+            if research.summaries:
+                raw_content = "\n\n".join(f"## {item['query']}\n\n{item['summary']}" for item in research.summaries)
+                st.session_state.report_result = raw_content
+
+                with message_container:
+                    st.write("⚠️ **Research completed but there was an issue generating the structured report.**")
+                    st.write("Raw research results are available in the Report tab.")
+            elif hasattr(research.triage_result, 'new_items'):
+                messages = [item for item in research.triage_result.new_items if hasattr(item, 'content')]
                 if messages:
                     raw_content = "\n\n".join([str(m.content) for m in messages if m.content])
                     st.session_state.report_result = raw_content
@@ -291,13 +304,15 @@ async def run_research(topic):
                         st.write("⚠️ **Research completed but there was an issue generating the structured report.**")
                         st.write("Raw research results are available in the Report tab.")
     
+    # The Report tab renders the finished report below, so drop the live view
+    report_placeholder.empty()
     st.session_state.research_done = True
 
 # Run the research when the button is clicked
 if start_button:
     with st.spinner(f"Researching: {user_topic}"):
         try:
-            asyncio.run(run_research(user_topic))
+            asyncio.run(with_agents_client(run_research, user_topic))
         except Exception as e:
             st.error(f"An error occurred during research: {str(e)}")
             # Set a basic report result so the user gets something
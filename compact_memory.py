@@ -0,0 +1,184 @@
+import os
+import math
+import time
+import sqlite3
+import argparse
+
+from dotenv import load_dotenv
+
+from vector_registry import vectorstore_registry
+from quota import BATCH, current_priority
+
+# Compaction job for memory.py's long-lived sessions:
+# drop expired turns, merge near-duplicates, roll old turns into summaries,
+# enforce a per-session size cap, then VACUUM the store.
+# Usage: python compact_memory.py [--session bharat] [--ttl-days 90] [--max-turns 200] [--dry-run]
+
+load_dotenv()
+
+SAMPLE_QUERIES = ["market analysis", "competitors and pricing", "target audience", "next steps"]
+
+
+def cosine_similarity(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def gemini_summarizer():
+    import google.generativeai as genai
+    from llm_cache import CachedGenerativeModel
+    from llm_clients import gemini_client
+
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
+
+    def summarize(turns):
+        prompt = (
+            "Summarize these earlier turns of a business-planning chat in a short paragraph. "
+            "Keep every concrete detail about the user's business (name, location, budget, audience, "
+            "competitors, decisions):\n\n" + "\n---\n".join(turns)
+        )
+        return model.generate_content(prompt).text.strip()
+
+    return summarize
+
+
+def extractive_summarizer(turns):
+    # Offline fallback: keep the user's side of each turn
+    lines = []
+    for turn in turns:
+        first = turn.split("\n", 1)[0]
+        lines.append(first[:200])
+    return "\n".join(lines)
+
+
+def list_sessions():
+    data = vectorstore_registry.store.get(include=["metadatas"])
+    return sorted({m.get("session_id") for m in data["metadatas"] if m and m.get("session_id")})
+
+
+def query_latency_ms(session_id):
+    view = vectorstore_registry.get(session_id)
+    started = time.perf_counter()
+    for query in SAMPLE_QUERIES:
+        view.similarity_search(query, k=5)
+    return (time.perf_counter() - started) * 1000 / len(SAMPLE_QUERIES)
+
+
+def store_size():
+    total = 0
+    for root, _, files in os.walk(vectorstore_registry.persist_dir):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def compact_session(session_id, args, summarize):
+    view = vectorstore_registry.get(session_id)
+    data = view.get(include=["documents", "metadatas", "embeddings"])
+    now = time.time()
+
+    # Oldest first; turns stored before created_at existed count as the oldest
+    turns = sorted(
+        zip(data["ids"], data["documents"], data["metadatas"], data["embeddings"]),
+        key=lambda t: (t[2] or {}).get("created_at", 0)
+    )
+    to_delete = set()
+
+    # 1. TTL (summaries are kept; they are what is left of expired detail)
+    if args.ttl_days:
+        cutoff = now - args.ttl_days * 86400
+        for doc_id, _, meta, _ in turns:
+            created = (meta or {}).get("created_at")
+            if created is not None and created < cutoff and (meta or {}).get("kind") != "summary":
+                to_delete.add(doc_id)
+
+    # 2. Near-duplicates: keep the newest copy
+    live = [t for t in turns if t[0] not in to_delete]
+    for i, (doc_id, _, _, embedding) in enumerate(live):
+        for _, _, _, newer in live[i + 1:]:
+            if cosine_similarity(embedding, newer) >= args.dedup_threshold:
+                to_delete.add(doc_id)
+                break
+    duplicates = len([t for t in live if t[0] in to_delete])
+
+    # 3. Roll everything but the most recent turns into periodic summaries
+    live = [t for t in turns if t[0] not in to_delete and (t[2] or {}).get("kind") != "summary"]
+    old = live[:-args.keep_recent] if args.keep_recent else live
+    summaries = []
+    for i in range(0, len(old) - len(old) % args.rollup_size, args.rollup_size):
+        group = old[i:i + args.rollup_size]
+        summaries.append((
+            "Summary of earlier conversation:\n" + summarize([t[1] for t in group]),
+            {"kind": "summary", "created_at": (group[-1][2] or {}).get("created_at", now),
+             "rolled_up_turns": len(group)},
+        ))
+        to_delete.update(t[0] for t in group)
+
+    # 4. Size cap: drop the oldest remaining entries
+    remaining = [t for t in turns if t[0] not in to_delete]
+    overflow = len(remaining) + len(summaries) - args.max_turns
+    if overflow > 0:
+        to_delete.update(t[0] for t in remaining[:overflow])
+
+    if not args.dry_run:
+        if summaries:
+            view.add_texts([s[0] for s in summaries], metadatas=[s[1] for s in summaries])
+        if to_delete:
+            view.delete(list(to_delete))
+
+    return {
+        "before": len(turns),
+        "after": len(turns) - len(to_delete) + len(summaries),
+        "duplicates": duplicates,
+        "summaries": len(summaries),
+    }
+
+
+def vacuum():
+    # Chroma keeps deleted rows' pages until the SQLite file is vacuumed
+    vectorstore_registry.close()
+    conn = sqlite3.connect(os.path.join(vectorstore_registry.persist_dir, "chroma.sqlite3"))
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact memory.py vector memory")
+    parser.add_argument("--session", action="append", help="only compact this session (repeatable)")
+    parser.add_argument("--ttl-days", type=float, default=float(os.getenv("MEMORY_TTL_DAYS", "90")),
+                        help="delete turns older than this (0 disables)")
+    parser.add_argument("--max-turns", type=int, default=int(os.getenv("MEMORY_MAX_TURNS", "200")))
+    parser.add_argument("--keep-recent", type=int, default=20, help="newest turns never rolled up")
+    parser.add_argument("--rollup-size", type=int, default=10, help="turns per summary")
+    parser.add_argument("--dedup-threshold", type=float, default=0.97)
+    parser.add_argument("--summarizer", choices=["gemini", "extractive"], default="gemini")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    # Rollup summaries yield the Gemini quota to interactive apps
+    current_priority.set(BATCH)
+    summarize = gemini_summarizer() if args.summarizer == "gemini" else extractive_summarizer
+    sessions = args.session or list_sessions()
+    size_before = store_size()
+
+    totals = {"before": 0, "after": 0}
+    for session_id in sessions:
+        latency_before = query_latency_ms(session_id)
+        result = compact_session(session_id, args, summarize)
+        latency_after = query_latency_ms(session_id)
+        totals["before"] += result["before"]
+        totals["after"] += result["after"]
+        print(f"{session_id}: {result['before']} → {result['after']} entries "
+              f"({result['duplicates']} duplicates, {result['summaries']} summaries), "
+              f"query {latency_before:.1f} → {latency_after:.1f} ms")
+
+    if not args.dry_run:
+        vacuum()
+    print(f"\nTotal: {totals['before']} → {totals['after']} entries, "
+          f"disk {size_before / 1e6:.1f} → {store_size() / 1e6:.1f} MB"
+          + (" (dry run)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+
+try:
+    import tiktoken
+    encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    encoding = None
+
+# Prompt budget for one model call, leaving room for the answer
+CONTEXT_MAX_TOKENS = int(os.getenv("CONTEXT_MAX_TOKENS", "6000"))
+# Most recent tool outputs that are always kept in full
+CONTEXT_KEEP_TOOL_OUTPUTS = int(os.getenv("CONTEXT_KEEP_TOOL_OUTPUTS", "2"))
+# Characters of an older tool output kept when it has to be trimmed
+CONTEXT_TOOL_PREVIEW_CHARS = int(os.getenv("CONTEXT_TOOL_PREVIEW_CHARS", "400"))
+
+
+def count_tokens(text):
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+def message_tokens(message):
+    # A few tokens of per-message overhead on top of the content
+    content = message.content if isinstance(message.content, str) else str(message.content)
+    return count_tokens(content) + count_tokens(str(getattr(message, "tool_calls", "") or "")) + 4
+
+
+class ContextWindow:
+    """Keeps the prompt of `MarketResearchAgent.call_model` inside a token budget.
+
+    - drops messages whose ID was already seen
+    - trims older tool outputs, then drops the oldest whole turns if still over budget
+    - prints the prompt-token usage of every model call
+    """
+
+    def __init__(self, max_tokens=CONTEXT_MAX_TOKENS, keep_tool_outputs=CONTEXT_KEEP_TOOL_OUTPUTS,
+                 tool_preview_chars=CONTEXT_TOOL_PREVIEW_CHARS):
+        self.max_tokens = max_tokens
+        self.keep_tool_outputs = keep_tool_outputs
+        self.tool_preview_chars = tool_preview_chars
+
+    def dedupe(self, messages):
+        seen = set()
+        unique = []
+        for message in messages:
+            if message.id is not None:
+                if message.id in seen:
+                    continue
+                seen.add(message.id)
+            unique.append(message)
+        return unique
+
+    def trim_tool_outputs(self, messages, reserved):
+        tool_indexes = [i for i, m in enumerate(messages) if m.type == "tool"]
+        older = tool_indexes[:-self.keep_tool_outputs] if self.keep_tool_outputs else tool_indexes
+        for i in older:
+            if self.total_tokens(messages) + reserved <= self.max_tokens:
+                break
+            content = str(messages[i].content)
+            if len(content) > self.tool_preview_chars:
+                messages[i] = messages[i].model_copy(update={
+                    "content": content[:self.tool_preview_chars] + f"\n[older tool output trimmed, {len(content)} chars]"
+                })
+        return messages
+
+    def drop_old_turns(self, messages, reserved):
+        # Cut at a human message so no AI tool call loses its tool results
+        while self.total_tokens(messages) + reserved > self.max_tokens:
+            starts = [i for i, m in enumerate(messages) if m.type == "human" and i > 0]
+            if not starts:
+                break
+            messages = messages[starts[0]:]
+        return messages
+
+    def total_tokens(self, messages):
+        return sum(message_tokens(m) for m in messages)
+
+    def prepare(self, messages, system_prompt=""):
+        """Messages to send to the model, within budget once `system_prompt` is added."""
+        reserved = count_tokens(system_prompt) if system_prompt else 0
+        messages = self.dedupe(messages)
+        messages = self.trim_tool_outputs(list(messages), reserved)
+        return self.drop_old_turns(messages, reserved)
+
+    def report(self, response, estimated):
+        usage = getattr(response, "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens", estimated)
+        print(f"Prompt tokens this turn: {prompt_tokens} (budget {self.max_tokens})")
+        return prompt_tokens
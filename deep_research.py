@@ -5,6 +5,7 @@ from agents import Agent, Runner, trace
 from agents import set_default_openai_key
 from firecrawl import FirecrawlApp
 from agents.tool import function_tool
+from llm_clients import with_agents_client
 
 # Set page configuration
 st.set_page_config(
@@ -123,11 +124,11 @@ elaboration_agent = Agent(
     """
 )
 
-async def run_research_process(topic: str):
+async def run_research_process(topic: str, run_config=None):
     """Run the complete research process."""
     # Step 1: Initial Research
     with st.spinner("Conducting initial research..."):
-        research_result = await Runner.run(research_agent, topic)
+        research_result = await Runner.run(research_agent, topic, run_config=run_config)
         initial_report = research_result.final_output
     
     # Display initial report in an expander
@@ -146,7 +147,7 @@ async def run_research_process(topic: str):
         and deeper insights while maintaining its academic rigor and factual accuracy.
         """
         
-        elaboration_result = await Runner.run(elaboration_agent, elaboration_input)
+        elaboration_result = await Runner.run(elaboration_agent, elaboration_input, run_config=run_config)
         enhanced_report = elaboration_result.final_output
     
     return enhanced_report
@@ -163,7 +164,7 @@ if st.button("Start Research", disabled=not (openai_api_key and firecrawl_api_ke
             report_placeholder = st.empty()
             
             # Run the research process
-            enhanced_report = asyncio.run(run_research_process(research_topic))
+            enhanced_report = asyncio.run(with_agents_client(run_research_process, research_topic, api_key=openai_api_key))
             
             # Display the enhanced report
             report_placeholder.markdown("## Enhanced Research Report")
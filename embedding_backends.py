@@ -0,0 +1,90 @@
+import os
+import re
+import math
+import hashlib
+
+from langchain_core.embeddings import Embeddings
+
+from embedding_cache import CachedEmbeddings
+
+# Which embedding backend the memory layer uses: gemini, local or hashing
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini")
+HASHING_EMBEDDING_DIM = int(os.getenv("HASHING_EMBEDDING_DIM", "512"))
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+# Written into each session directory so a store is never queried with another backend's vectors
+BACKEND_MARKER = "embedding_backend.txt"
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbeddings(Embeddings):
+    """In-process feature-hashing vectorizer: no network, no model download.
+
+    Words and word bigrams are hashed into `dim` signed buckets with sublinear
+    term frequency, then L2-normalised, so cosine similarity behaves like a
+    TF-based lexical match.
+    """
+
+    def __init__(self, dim=HASHING_EMBEDDING_DIM):
+        self.dim = dim
+
+    def features(self, text):
+        words = TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, text):
+        counts = {}
+        for feature in self.features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            counts[bucket] = counts.get(bucket, 0.0) + sign
+
+        vector = [0.0] * self.dim
+        for bucket, value in counts.items():
+            vector[bucket] = math.copysign(1.0 + math.log(abs(value)), value) if value else 0.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts):
+        return [self.embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed(text)
+
+
+def get_embedding_backend(name=EMBEDDING_BACKEND):
+    """Embedding model for `name`; remote and model-based backends get the on-disk cache."""
+    if name == "gemini":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return CachedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=os.getenv("GOOGLE_API_KEY")),
+            model_name="models/embedding-001",
+        )
+    if name == "local":
+        # Optional dependency: pip install sentence-transformers langchain-huggingface
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        return CachedEmbeddings(
+            HuggingFaceEmbeddings(model_name=LOCAL_EMBEDDING_MODEL, model_kwargs={"device": "cpu"}),
+            model_name=LOCAL_EMBEDDING_MODEL,
+        )
+    if name == "hashing":
+        return HashingEmbeddings()
+    raise ValueError(f"Unknown embedding backend: {name!r} (expected gemini, local or hashing)")
+
+
+def read_backend_marker(persist_dir):
+    # Stores created before backends were selectable were all embedded with Gemini
+    try:
+        with open(os.path.join(persist_dir, BACKEND_MARKER), encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return "gemini"
+
+
+def write_backend_marker(persist_dir, name):
+    with open(os.path.join(persist_dir, BACKEND_MARKER), "w", encoding="utf-8") as f:
+        f.write(name)
@@ -0,0 +1,92 @@
+import os
+import array
+import sqlite3
+import hashlib
+from contextlib import closing
+
+from langchain_core.embeddings import Embeddings
+
+from sqlite_cache import SQLiteCache
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("bizai_cache", "embedding_cache.sqlite3"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+# A model's vector for a text never changes; entries mostly leave through LRU eviction
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", str(365 * 24 * 3600)))
+
+
+def to_blob(vector):
+    return array.array("f", vector).tobytes()
+
+
+def from_blob(blob):
+    vector = array.array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+def drop_legacy_table(path):
+    # Vectors used to live in their own `embeddings` table in this file; nothing reads it now
+    with closing(sqlite3.connect(path, timeout=30)) as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'embeddings'"
+        ).fetchone()
+        if exists:
+            conn.execute("DROP TABLE embeddings")
+            conn.commit()
+            conn.execute("VACUUM")
+
+
+class CachedEmbeddings(Embeddings):
+    """Content-addressed cache in front of another LangChain embedding model.
+
+    Vectors are stored in a `SQLiteCache` as float32 blobs keyed by a hash of
+    (model, query/document, text), with LRU eviction past `max_entries`.
+    """
+
+    def __init__(self, embeddings, model_name, path=EMBEDDING_CACHE_PATH, max_entries=EMBEDDING_CACHE_MAX_ENTRIES,
+                 ttl=EMBEDDING_CACHE_TTL):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = SQLiteCache(path, max_entries=max_entries, default_ttl=ttl)
+        drop_legacy_table(path)
+
+    def content_hash(self, text, kind):
+        # Query and document embeddings differ for retrieval models, so they are cached apart
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts):
+        hashes = [self.content_hash(text, "document") for text in texts]
+        found = {h: from_blob(blob) for h, blob in self.cache.get_many(hashes).items()}
+
+        missing = {}
+        for text, content_hash in zip(texts, hashes):
+            if content_hash not in found:
+                missing.setdefault(content_hash, text)
+
+        if missing:
+            # Only the texts never seen before go to the underlying model, in one call
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new = dict(zip(missing.keys(), vectors))
+            self.cache.set_many({h: to_blob(vector) for h, vector in new.items()}, namespace=self.model_name)
+            found.update(new)
+        return [found[content_hash] for content_hash in hashes]
+
+    def embed_query(self, text):
+        content_hash = self.content_hash(text, "query")
+        blob = self.cache.get(content_hash)
+        if blob is not None:
+            return from_blob(blob)
+
+        vector = self.embeddings.embed_query(text)
+        self.cache.set(content_hash, to_blob(vector), namespace=self.model_name)
+        return vector
+
+    def prime(self, texts, vectors):
+        """Store document vectors already made by this model, e.g. copied from an older store."""
+        self.cache.set_many(
+            {self.content_hash(text, "document"): to_blob(vector) for text, vector in zip(texts, vectors)},
+            namespace=self.model_name
+        )
+
+    def stats(self):
+        return self.cache.stats()
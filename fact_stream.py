@@ -0,0 +1,57 @@
+import asyncio
+from contextvars import ContextVar
+
+# Fact channel of the research run executing in the current task context
+current_fact_channel = ContextVar("current_fact_channel", default=None)
+
+
+class FactChannel:
+    """Per-run async channel that `save_important_fact` publishes into."""
+
+    _CLOSED = object()
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def publish(self, fact):
+        # Tools may run in a worker thread, so always hand over via the loop
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, fact)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, self._CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        fact = await self.queue.get()
+        if fact is self._CLOSED:
+            raise StopAsyncIteration
+        return fact
+
+
+def publish_fact(fact):
+    """Send a fact to the current run's channel, if a run is listening."""
+    channel = current_fact_channel.get()
+    if channel is not None:
+        channel.publish(fact)
+
+
+async def run_with_fact_stream(coro, on_fact):
+    """Run `coro` while passing every published fact to `on_fact` as it arrives.
+
+    Returns the result of `coro` as soon as it finishes; no polling delay.
+    """
+    channel = FactChannel()
+    token = current_fact_channel.set(channel)
+    try:
+        # The task copies the current context, so its tools see this channel
+        task = asyncio.create_task(coro)
+    finally:
+        current_fact_channel.reset(token)
+    task.add_done_callback(lambda _: channel.close())
+
+    async for fact in channel:
+        on_fact(fact)
+    return await task
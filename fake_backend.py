@@ -0,0 +1,57 @@
+import os
+import asyncio
+
+from fastapi import FastAPI
+from pydantic import BaseModel
+import uvicorn
+
+# Local stand-in for the chat backend used by s.py / summarize.py.
+# Run it and point CHAT_BACKEND_URL at it, or mount it in-process with
+# httpx.ASGITransport(app=app).
+
+# Artificial per-request latency in seconds
+FAKE_BACKEND_LATENCY = float(os.getenv("FAKE_BACKEND_LATENCY", "0"))
+# Messages generated for projects that were never seeded
+FAKE_BACKEND_MESSAGES = int(os.getenv("FAKE_BACKEND_MESSAGES", "20"))
+
+app = FastAPI()
+
+chats = {}
+saved_summaries = {}
+
+
+class SummaryPayload(BaseModel):
+    content: str
+
+
+def sample_messages(count):
+    return [
+        {
+            "isUser": i % 2 == 0,
+            "content": f"Question {i // 2 + 1} about the shoe shop plan" if i % 2 == 0
+            else f"Answer {i // 2 + 1} with market details for the shoe shop"
+        }
+        for i in range(count)
+    ]
+
+
+def seed_chat(clerk_id, project_id, messages):
+    chats[(clerk_id, project_id)] = list(messages)
+
+
+@app.get("/api/v1/chats/{clerk_id}/{project_id}/executive_summary")
+async def get_executive_summary(clerk_id: str, project_id: str):
+    await asyncio.sleep(FAKE_BACKEND_LATENCY)
+    messages = chats.setdefault((clerk_id, project_id), sample_messages(FAKE_BACKEND_MESSAGES))
+    return {"message_Data": {"messages": messages}}
+
+
+@app.put("/api/v1/chats/save-type-summary/{clerk_id}/{project_id}/executive_summary")
+async def save_executive_summary(clerk_id: str, project_id: str, payload: SummaryPayload):
+    await asyncio.sleep(FAKE_BACKEND_LATENCY)
+    saved_summaries[(clerk_id, project_id)] = payload.content
+    return {"status": "saved"}
+
+
+if __name__ == "__main__":
+    uvicorn.run("fake_backend:app", host="127.0.0.1", port=5000)
@@ -0,0 +1,265 @@
+import time
+import json
+import random
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+
+# Deterministic local stand-ins for Gemini, OpenAI (LangChain and Agents SDK),
+# SerpAPI, Tavily and the embedding backend, used by benchmark.py.
+# Latency follows a profile: a fixed base per call plus time per prompt token
+# and per generated token, with jitter derived from the input so repeated runs
+# of the same workload sleep exactly the same.
+
+PROFILES = {
+    # No waiting at all: measures the code's own overhead
+    "instant": dict(llm_base=0, llm_prefill=0, llm_tokens_per_s=0, search=0, embed=0, backend=0, jitter=0),
+    # Quick enough for a local regression run
+    "fast": dict(llm_base=0.05, llm_prefill=0.00001, llm_tokens_per_s=4000, search=0.05, embed=0.005,
+                 backend=0.005, jitter=0.2),
+    # Roughly what the hosted providers show
+    "realistic": dict(llm_base=0.4, llm_prefill=0.0002, llm_tokens_per_s=90, search=0.8, embed=0.08,
+                      backend=0.03, jitter=0.3),
+}
+
+# Tokens generated per kind of call
+TOKEN_PROFILE = {
+    "answer": 450,
+    "summary": 40,
+    "plan": 120,
+    "research": 300,
+    "report": 1500,
+    "agent_step": 60,
+}
+
+WORDS = ("market growth CAGR competitors pricing audience Gen-Z retail online segment demand supply "
+         "margin brand channel strategy region trend risk opportunity launch budget customer").split()
+
+
+class LatencyProfile:
+    """Latency settings of one named profile, with any of them overridden."""
+
+    def __init__(self, name="fast", tokens=None, **overrides):
+        self.name = name
+        settings = dict(PROFILES[name], **overrides)
+        for key, value in settings.items():
+            setattr(self, key, float(value))
+        self.tokens = dict(TOKEN_PROFILE, **(tokens or {}))
+
+    def factor(self, seed):
+        # Same input, same jitter
+        digest = hashlib.sha256(str(seed).encode("utf-8")).digest()
+        return 1 + self.jitter * (int.from_bytes(digest[:4], "little") / 2 ** 32 * 2 - 1)
+
+    def llm_seconds(self, prompt, kind):
+        generated = self.tokens[kind] / self.llm_tokens_per_s if self.llm_tokens_per_s else 0
+        seconds = self.llm_base + approx_tokens(prompt) * self.llm_prefill + generated
+        return seconds * self.factor((kind, prompt))
+
+    def seconds(self, stage, seed):
+        return getattr(self, stage) * self.factor((stage, seed))
+
+
+class StageRecorder:
+    """Collects how long each stage took, across threads and tasks."""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.samples = {}
+
+    def timed(self, stage):
+        return _Timed(self, stage)
+
+
+class _Timed:
+    def __init__(self, recorder, stage):
+        self.recorder = recorder
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter() - self.started)
+
+
+recorder = StageRecorder()
+
+
+def approx_tokens(text):
+    return max(1, len(str(text)) // 4)
+
+
+def fake_text(seed, tokens):
+    rng = random.Random(hashlib.sha256(str(seed).encode("utf-8")).hexdigest())
+    return " ".join(rng.choice(WORDS) for _ in range(max(1, tokens)))
+
+
+class FakeGenerativeModel:
+    """Stands in for `genai.GenerativeModel`; every call generates `kind` tokens."""
+
+    def __init__(self, profile, kind="answer", model_name="models/gemini-2.0-flash"):
+        self.profile = profile
+        self.kind = kind
+        self.model_name = model_name
+
+    def _response(self, prompt):
+        text = fake_text(prompt, self.profile.tokens[self.kind])
+        return SimpleNamespace(text=text, usage_metadata=SimpleNamespace(
+            prompt_token_count=approx_tokens(prompt), candidates_token_count=self.profile.tokens[self.kind]
+        ))
+
+    def generate_content(self, prompt, **kwargs):
+        with recorder.timed("llm:gemini"):
+            time.sleep(self.profile.llm_seconds(prompt, self.kind))
+            return self._response(prompt)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        with recorder.timed("llm:gemini"):
+            await asyncio.sleep(self.profile.llm_seconds(prompt, self.kind))
+            return self._response(prompt)
+
+
+class FakeSearch:
+    """Stands in for SerpAPIWrapper (`provider="serpapi"`) or TavilySearchResults ("tavily")."""
+
+    def __init__(self, profile, provider="serpapi", results=5):
+        self.profile = profile
+        self.provider = provider
+        self.params = {"engine": "google", "fake": True}
+        self.max_results = results
+
+    def run(self, query):
+        with recorder.timed(f"search:{self.provider}"):
+            time.sleep(self.profile.seconds("search", query))
+            snippets = [fake_text((query, i), 30) for i in range(self.max_results)]
+            if self.provider == "tavily":
+                return [{"url": f"https://example.com/{i}", "content": s} for i, s in enumerate(snippets)]
+            return str(snippets)
+
+
+class FakeEmbeddings:
+    """Hashing embeddings with an embedding API's round-trip latency in front of them."""
+
+    def __init__(self, profile):
+        from embedding_backends import HashingEmbeddings
+
+        self.profile = profile
+        self.embeddings = HashingEmbeddings()
+
+    def embed_documents(self, texts):
+        with recorder.timed("embed"):
+            time.sleep(self.profile.seconds("embed", len(texts)))
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        with recorder.timed("embed"):
+            time.sleep(self.profile.seconds("embed", text))
+            return self.embeddings.embed_query(text)
+
+
+class FakeChatModel:
+    """Stands in for `ChatOpenAI` inside api.py's graph.
+
+    The first model turn after a user message calls every bound tool once;
+    the turn after the tool results answers.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.tool_names = []
+
+    def bind_tools(self, tools):
+        self.tool_names = [t.name for t in tools]
+        return self
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage, HumanMessage
+
+        prompt = "\n".join(str(m.content) for m in messages)
+        last = messages[-1]
+        kind = "agent_step" if isinstance(last, HumanMessage) else "answer"
+        with recorder.timed("llm:openai"):
+            time.sleep(self.profile.llm_seconds(prompt, kind))
+        usage = {"input_tokens": approx_tokens(prompt), "output_tokens": self.profile.tokens[kind],
+                 "total_tokens": approx_tokens(prompt) + self.profile.tokens[kind]}
+
+        if kind == "agent_step":
+            calls = [{"name": name, "args": {"query": str(last.content)[:200]}, "id": f"call_{i}_{len(messages)}"}
+                     for i, name in enumerate(self.tool_names)]
+            return AIMessage(content="", tool_calls=calls, usage_metadata=usage)
+        return AIMessage(content="Here is your market analysis summary. " + fake_text(prompt, 40),
+                         usage_metadata=usage)
+
+
+class FakeRunner:
+    """Stands in for the Agents SDK `Runner` used by research_pipeline and report_stream.
+
+    The triage agent returns a plan with `queries` search queries, any other
+    agent run returns a research summary, and `run_streamed` streams a
+    structured report as JSON text deltas.
+    """
+
+    profile = LatencyProfile("fast")
+    queries = 4
+
+    @classmethod
+    async def run(cls, agent, agent_input, **kwargs):
+        kind = "plan" if "Triage" in agent.name else "research"
+        with recorder.timed(f"llm:agents:{kind}"):
+            await asyncio.sleep(cls.profile.llm_seconds(agent_input, kind))
+        if kind == "plan":
+            output = SimpleNamespace(
+                topic=str(agent_input)[:80],
+                search_queries=[f"{agent_input} angle {i + 1}" for i in range(cls.queries)],
+                focus_areas=["market size", "competitors", "pricing"],
+            )
+        else:
+            output = fake_text(agent_input, cls.profile.tokens["research"])
+        return SimpleNamespace(final_output=output, to_input_list=lambda: [{"role": "user", "content": agent_input}])
+
+    @classmethod
+    def run_streamed(cls, agent, agent_input, **kwargs):
+        return FakeStreamedRun(cls.profile, agent_input)
+
+
+class FakeStreamedRun:
+    # Tokens per streamed delta; the real API sends a few at a time too
+    CHUNK_TOKENS = 8
+
+    def __init__(self, profile, agent_input):
+        self.profile = profile
+        self.agent_input = agent_input
+        self.final_output = None
+
+    async def stream_events(self):
+        from openai.types.responses import ResponseTextDeltaEvent
+
+        tokens = self.profile.tokens["report"]
+        report = fake_text(self.agent_input, tokens)
+        payload = json.dumps({"title": "Benchmark report", "outline": ["Overview"], "report": report,
+                              "sources": [], "word_count": tokens})
+        seconds = self.profile.llm_seconds(self.agent_input, "report")
+        chunk_chars = self.CHUNK_TOKENS * 4
+        chunks = max(1, len(payload) // chunk_chars)
+
+        with recorder.timed("llm:agents:report"):
+            for i in range(0, len(payload), chunk_chars):
+                await asyncio.sleep(seconds / chunks)
+                delta = ResponseTextDeltaEvent.model_construct(
+                    delta=payload[i:i + chunk_chars], type="response.output_text.delta"
+                )
+                yield SimpleNamespace(type="raw_response_event", data=delta)
+
+        data = json.loads(payload)
+        self.final_output = SimpleNamespace(**data)
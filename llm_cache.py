@@ -0,0 +1,156 @@
+import os
+import json
+import math
+import asyncio
+
+import google.generativeai as genai
+
+from sqlite_cache import SQLiteCache, make_key
+from llm_clients import retry_call
+from quota import quota
+from single_flight import AsyncSingleFlight, SingleFlight
+
+# Seconds a cached answer stays valid
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+
+# Semantic tier is opt-in: it costs one embedding call per cache miss
+LLM_SEMANTIC_CACHE = os.getenv("LLM_SEMANTIC_CACHE", "0") == "1"
+LLM_SEMANTIC_THRESHOLD = float(os.getenv("LLM_SEMANTIC_THRESHOLD", "0.95"))
+
+cache_dir = os.getenv("LLM_CACHE_DIR", "bizai_cache")
+exact_cache = SQLiteCache(
+    os.path.join(cache_dir, "llm_cache.sqlite3"),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")),
+    default_ttl=LLM_CACHE_TTL,
+)
+semantic_cache = SQLiteCache(
+    os.path.join(cache_dir, "llm_semantic_cache.sqlite3"),
+    max_entries=int(os.getenv("LLM_SEMANTIC_MAX_ENTRIES", "1000")),
+    default_ttl=LLM_CACHE_TTL,
+)
+
+# The same uncached prompt sent twice at once (reruns, several sessions) makes one Gemini call
+llm_flight = SingleFlight()
+async_llm_flight = AsyncSingleFlight()
+
+
+def gemini_embedding(text):
+    def embed():
+        quota.acquire("gemini", "embedding-001")
+        return genai.embed_content(model="models/embedding-001", content=text)
+
+    return retry_call(embed)["embedding"]
+
+
+def cosine_similarity(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class CachedResponse:
+    """Stands in for a Gemini response when the answer comes from the cache."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class CachedGenerativeModel:
+    """Wraps a `genai.GenerativeModel` so `generate_content` reuses earlier answers.
+
+    Exact tier: hash of model + prompt (+ call options).
+    Semantic tier (optional): answer of the most similar earlier prompt, if its
+    embedding similarity is at least `threshold`.
+    """
+
+    def __init__(self, model, semantic=LLM_SEMANTIC_CACHE, threshold=LLM_SEMANTIC_THRESHOLD,
+                 embed_fn=gemini_embedding, exact=exact_cache, similar=semantic_cache):
+        self.model = model
+        self.model_name = getattr(model, "model_name", str(model))
+        self.semantic = semantic
+        self.threshold = threshold
+        self.embed_fn = embed_fn
+        self.exact = exact
+        self.similar = similar
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def generate_content(self, prompt, **kwargs):
+        key = make_key(self.model_name, prompt, kwargs)
+        cached = self.exact.get(key)
+        if cached is not None:
+            return CachedResponse(cached)
+
+        embedding = None
+        if self.semantic and not kwargs and isinstance(prompt, str):
+            embedding = self.embed_fn(prompt)
+            cached = self.lookup_similar(embedding)
+            if cached is not None:
+                return CachedResponse(cached)
+
+        return llm_flight.do(key, self._generate, key, embedding, prompt, **kwargs)
+
+    def _generate(self, key, embedding, prompt, **kwargs):
+        response = self.model.generate_content(prompt, **kwargs)
+        try:
+            self.store(key, response.text, embedding)
+        except ValueError:
+            # Blocked or empty candidates have no text; leave that to the caller
+            pass
+        return response
+
+    async def generate_content_async(self, prompt, **kwargs):
+        key = make_key(self.model_name, prompt, kwargs)
+        cached = self.exact.get(key)
+        if cached is not None:
+            return CachedResponse(cached)
+
+        embedding = None
+        if self.semantic and not kwargs and isinstance(prompt, str):
+            embedding = await asyncio.to_thread(self.embed_fn, prompt)
+            cached = self.lookup_similar(embedding)
+            if cached is not None:
+                return CachedResponse(cached)
+
+        return await async_llm_flight.do(key, self._generate_async, key, embedding, prompt, **kwargs)
+
+    async def _generate_async(self, key, embedding, prompt, **kwargs):
+        response = await self.model.generate_content_async(prompt, **kwargs)
+        try:
+            self.store(key, response.text, embedding)
+        except ValueError:
+            pass
+        return response
+
+    def lookup_similar(self, embedding):
+        namespace = f"semantic:{self.model_name}"
+        best_key, best_score = None, self.threshold
+        for key, value in self.similar.entries(namespace):
+            score = cosine_similarity(embedding, json.loads(value)["embedding"])
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            self.similar.misses += 1
+            return None
+        value = self.similar.get(best_key)
+        return json.loads(value)["text"] if value is not None else None
+
+    def store(self, key, text, embedding=None):
+        if not text:
+            return
+        self.exact.set(key, text, namespace=f"exact:{self.model_name}")
+        if embedding is not None:
+            self.similar.set(
+                key,
+                json.dumps({"embedding": embedding, "text": text}),
+                namespace=f"semantic:{self.model_name}",
+            )
+
+    def stats(self):
+        return {
+            "exact": self.exact.stats(),
+            "semantic": self.similar.stats(),
+            "single_flight": {"sync": llm_flight.stats(), "async": async_llm_flight.stats()},
+        }
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import random
+import asyncio
+import itertools
+import threading
+from contextlib import asynccontextmanager
+
+import httpx
+
+from quota import QuotaTimeout, quota
+
+# One place for every LLM client the scripts, Streamlit apps and FastAPI services use:
+# shared HTTP connections, one timeout and one retry policy for every provider.
+# Sync clients are process-wide; async ones live for one event loop run.
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+
+_lock = threading.Lock()
+_http_client = None
+_clients = {}
+
+
+def is_retryable(exc):
+    """True for rate limits (429), server errors (5xx), timeouts and dropped connections."""
+    if isinstance(exc, QuotaTimeout):
+        # Already waited the full quota deadline; retrying would only queue again
+        return False
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError, ConnectionError, TimeoutError,
+                        asyncio.TimeoutError)):
+        return True
+    # openai.APIStatusError / httpx.HTTPStatusError carry the status on the response,
+    # google.api_core.exceptions.GoogleAPICallError carries it as `code`
+    response = getattr(exc, "response", None)
+    status = getattr(exc, "status_code", None) or getattr(response, "status_code", None) or getattr(exc, "code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    name = type(exc).__name__
+    return name in ("APIConnectionError", "APITimeoutError", "ServiceUnavailable", "DeadlineExceeded")
+
+
+def backoff_delay(attempt, exc=None):
+    """Jittered exponential backoff; a server's Retry-After wins if it asks for longer."""
+    delay = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt)
+    delay = random.uniform(delay / 2, delay)
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        delay = max(delay, min(LLM_BACKOFF_MAX, float(headers.get("retry-after", 0))))
+    except (TypeError, ValueError):
+        pass
+    return delay
+
+
+def retry_delay(attempt, exc, retries=LLM_MAX_RETRIES):
+    """Seconds to wait before retrying after failed `attempt` (0-based), or None to give up and raise."""
+    if attempt >= retries or not is_retryable(exc):
+        return None
+    return backoff_delay(attempt, exc)
+
+
+def retry_call(fn, *args, retries=LLM_MAX_RETRIES, **kwargs):
+    for attempt in itertools.count():
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            delay = retry_delay(attempt, e, retries)
+            if delay is None:
+                raise
+        time.sleep(delay)
+
+
+async def retry_call_async(fn, *args, retries=LLM_MAX_RETRIES, **kwargs):
+    for attempt in itertools.count():
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            delay = retry_delay(attempt, e, retries)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+
+
+def request_model(request):
+    try:
+        return json.loads(request.content).get("model")
+    except (ValueError, AttributeError, httpx.RequestNotRead):
+        return None
+
+
+def _is_retry_status(response):
+    return response.status_code == 429 or response.status_code >= 500
+
+
+class RetryingTransport(httpx.BaseTransport):
+    """Takes OpenAI quota, then sends, retrying with the shared policy.
+
+    The OpenAI SDK runs with max_retries=0 on top of it: the SDK would retry
+    any exception from the send, a QuotaTimeout included, and wait out the
+    quota once per attempt. Here a QuotaTimeout fails the call after one wait.
+    """
+
+    def __init__(self, transport, retries=LLM_MAX_RETRIES):
+        self.transport = transport
+        self.retries = retries
+
+    def _attempt(self, request, model):
+        quota.acquire("openai", model)
+        response = self.transport.handle_request(request)
+        if _is_retry_status(response):
+            # Read so the body and Retry-After survive for the last attempt and backoff
+            response.read()
+            raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=request, response=response)
+        return response
+
+    def handle_request(self, request):
+        try:
+            return retry_call(self._attempt, request, request_model(request), retries=self.retries)
+        except httpx.HTTPStatusError as e:
+            # Out of retries: the SDK turns the last response into its usual error
+            return e.response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRetryingTransport(httpx.AsyncBaseTransport):
+    """`RetryingTransport` for `httpx.AsyncClient`."""
+
+    def __init__(self, transport, retries=LLM_MAX_RETRIES):
+        self.transport = transport
+        self.retries = retries
+
+    async def _attempt(self, request, model):
+        await quota.acquire_async("openai", model)
+        response = await self.transport.handle_async_request(request)
+        if _is_retry_status(response):
+            # Read so the body and Retry-After survive for the last attempt and backoff
+            await response.aread()
+            raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=request, response=response)
+        return response
+
+    async def handle_async_request(self, request):
+        try:
+            return await retry_call_async(self._attempt, request, request_model(request), retries=self.retries)
+        except httpx.HTTPStatusError as e:
+            return e.response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _pool_limits():
+    return httpx.Limits(max_connections=LLM_POOL_SIZE, max_keepalive_connections=LLM_POOL_SIZE)
+
+
+def http_client():
+    """Process-wide pooled httpx client for synchronous OpenAI calls."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                transport=RetryingTransport(httpx.HTTPTransport(limits=_pool_limits())),
+            )
+        return _http_client
+
+
+def _cached(key, build):
+    with _lock:
+        if key not in _clients:
+            _clients[key] = build()
+        return _clients[key]
+
+
+def openai_client(api_key=None):
+    """Shared `openai.OpenAI`; its transport retries 429/5xx with jittered exponential backoff."""
+    from openai import OpenAI
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    pool = http_client()
+    return _cached(("openai", api_key), lambda: OpenAI(
+        api_key=api_key, http_client=pool, timeout=LLM_TIMEOUT, max_retries=0,
+    ))
+
+
+def async_openai_client(api_key=None):
+    """New `openai.AsyncOpenAI` with its own connection pool.
+
+    An httpx async pool belongs to the event loop that first used it, and the
+    Streamlit apps start a new loop (`asyncio.run`) per click and per session
+    thread, so this is never cached: make one per run and close it after.
+    """
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=api_key or os.getenv("OPENAI_API_KEY"), timeout=LLM_TIMEOUT, max_retries=0,
+        http_client=httpx.AsyncClient(
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            follow_redirects=True,
+            transport=AsyncRetryingTransport(httpx.AsyncHTTPTransport(limits=_pool_limits())),
+        ),
+    )
+
+
+@asynccontextmanager
+async def agents_run_config(api_key=None):
+    """Agents SDK `RunConfig` whose model calls share one client for this event loop."""
+    from agents import RunConfig
+    from agents.models.openai_provider import OpenAIProvider
+
+    client = async_openai_client(api_key)
+    try:
+        yield RunConfig(model_provider=OpenAIProvider(openai_client=client))
+    finally:
+        await client.close()
+
+
+async def with_agents_client(fn, *args, api_key=None):
+    """Awaits `fn(*args, run_config=...)` with a client made for the running loop; use inside `asyncio.run`."""
+    async with agents_run_config(api_key) as run_config:
+        return await fn(*args, run_config=run_config)
+
+
+def chat_openai(model="gpt-4", **kwargs):
+    """LangChain `ChatOpenAI` on the shared connection pool, timeout and retry policy."""
+    from langchain_openai import ChatOpenAI
+
+    kwargs.setdefault("timeout", LLM_TIMEOUT)
+    # Retries happen in http_client()'s transport, after the quota wait
+    kwargs.setdefault("max_retries", 0)
+    return ChatOpenAI(model=model, http_client=http_client(), **kwargs)
+
+
+class RetryingGenerativeModel:
+    """Wraps a `genai.GenerativeModel` with the shared timeout and retry policy."""
+
+    def __init__(self, model, timeout=LLM_TIMEOUT, retries=LLM_MAX_RETRIES):
+        self.model = model
+        self.timeout = timeout
+        self.retries = retries
+        # Quota bucket name: "models/gemini-2.0-flash" -> "gemini-2.0-flash"
+        self.quota_model = getattr(model, "model_name", str(model)).rpartition("/")[2]
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _options(self, kwargs):
+        kwargs["request_options"] = {"timeout": self.timeout, **(kwargs.get("request_options") or {})}
+        return kwargs
+
+    def _generate(self, prompt, **kwargs):
+        quota.acquire("gemini", self.quota_model)
+        return self.model.generate_content(prompt, **kwargs)
+
+    async def _generate_async(self, prompt, **kwargs):
+        await quota.acquire_async("gemini", self.quota_model)
+        return await self.model.generate_content_async(prompt, **kwargs)
+
+    def generate_content(self, prompt, **kwargs):
+        return retry_call(self._generate, prompt, retries=self.retries, **self._options(kwargs))
+
+    async def generate_content_async(self, prompt, **kwargs):
+        return await retry_call_async(self._generate_async, prompt, retries=self.retries, **self._options(kwargs))
+
+
+def gemini_client(model="gemini-2.0-flash"):
+    """Shared Gemini model; genai keeps one gRPC channel per process for all of them."""
+    import google.generativeai as genai
+
+    return _cached(("gemini", model), lambda: RetryingGenerativeModel(genai.GenerativeModel(model)))
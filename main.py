@@ -1,7 +1,10 @@
 import os
 from dotenv import load_dotenv
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
+from llm_clients import gemini_client
 
 # Load environment variables from .env file
 load_dotenv()
@@ -9,8 +12,8 @@ os.environ["SERPAPI_API_KEY"] = os.getenv("SERPAPI_API_KEY")
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Initialize web search and generative model
-search = SerpAPIWrapper()
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")  # or use "gemini-pro" if needed
+search = CachedSearch(SerpAPIWrapper(), "serpapi")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))  # or use "gemini-pro" if needed
 
 # Take user input
 user_input = input("Enter your business question for competitive analysis: ")
@@ -1,6 +1,7 @@
-from langchain.chat_models import ChatOpenAI
+from llm_clients import chat_openai
 from langchain.agents import initialize_agent, Tool
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
 import os
 from dotenv import load_dotenv
 
@@ -10,7 +11,7 @@ serp_api_key = os.getenv("SERP_API_KEY")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
 # Initialize SerpAPI
-search = SerpAPIWrapper(serpapi_api_key=serp_api_key)
+search = CachedSearch(SerpAPIWrapper(serpapi_api_key=serp_api_key), "serpapi")
 
 # Define Tool with Competitive Focus
 tools = [
@@ -22,10 +23,10 @@ tools = [
 ]
 
 # Load LLM (GPT-4)
-llm = ChatOpenAI(
+llm = chat_openai(
+    "gpt-4",
     temperature=0,
-    openai_api_key=openai_api_key,
-    model="gpt-4"
+    openai_api_key=openai_api_key
 )
 
 # Initialize Agent
@@ -3,19 +3,22 @@ import uuid
 import streamlit as st
 from dotenv import load_dotenv
 
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain.vectorstores import Chroma
 from langchain.docstore.document import Document
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
+from vector_registry import vectorstore_registry
+from memory_writer import memory_writer
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
+from llm_clients import gemini_client
 
 # Load keys
 load_dotenv()
 os.environ["SERPAPI_API_KEY"] = os.getenv("SERPAPI_API_KEY")
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-search = SerpAPIWrapper()
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+search = CachedSearch(SerpAPIWrapper(), "serpapi")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
 
 # Helper to clean bot response
 def strip_bot(bot_response):
@@ -29,12 +32,57 @@ def get_user_session():
         st.session_state.user_session_id = str(uuid.uuid4())[:8]  # simple unique ID
     return st.session_state.user_session_id
 
-# Setup vector memory per user
+# Setup vector memory per user (shared handles, reused across reruns)
 def get_vectorstore(session_id):
-    embedding_model = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=os.getenv("GOOGLE_API_KEY"))
-    persist_dir = os.path.join("bizai_sessions", session_id)
-    os.makedirs(persist_dir, exist_ok=True)
-    return Chroma(persist_directory=persist_dir, embedding_function=embedding_model)
+    return vectorstore_registry.get(session_id)
+
+# One chat turn without the UI: recall memory, search, ask Gemini, queue the turn for storage
+def answer_turn(session_id, user_name, user_input):
+    vectorstore = get_vectorstore(session_id)
+
+    # Long memory retrieval
+    docs = vectorstore.similarity_search(user_input, k=5)
+    long_memory = "\n---\n".join([doc.page_content for doc in docs])
+
+    # Web search
+    serp_result = search.run(user_input)
+
+    # Prompt
+    prompt = f"""
+You are a smart, friendly AI business assistant named "BizAI".
+
+🎯 Your Goal:
+Help the user build a strong business plan by first collecting all essential details. Once sufficient info is gathered, perform a detailed **market analysis** including real-world data such as **CAGR** and competitor insights.
+
+📋 Step-by-Step Instructions:
+1. 📥 **Gather Info** (name, type, audience, USP, competitors...)
+2. 📊 **Market Analysis** (overview, audience, CAGR, trends, risks)
+3. 📌 **Suggestions** for next steps
+
+🔎 Web Search:
+{serp_result}
+
+🧠 Long-Term Context for {user_name}:
+{long_memory}
+
+💬 User Question:
+User: {user_input}
+    """.strip()
+
+    gemini_response = gemini_model.generate_content(prompt)
+    response_text = gemini_response.text.strip()
+
+    final_answer = (
+        f"🤖 **BizAI:**\n\n{response_text}\n\n"
+        "📌 Let me know if you'd like help drafting a section, finding suppliers, or exploring your competition."
+    )
+
+    # Stored in the background, batched with other pending turns
+    memory_writer.submit(session_id, Document(
+        page_content=f"User: {user_input}\nAssistant: {response_text}"
+    ))
+
+    return final_answer
 
 def main():
     st.set_page_config(page_title="🌐 BizAI - Business Assistant", layout="wide")
@@ -45,8 +93,6 @@ def main():
     session_id = user_name.strip().lower().replace(" ", "_")
     st.caption(f"🔐 Session ID: `{session_id}` — Your data will be kept separate.")
 
-    vectorstore = get_vectorstore(session_id)
-
     if f"chat_history_{session_id}" not in st.session_state:
         st.session_state[f"chat_history_{session_id}"] = []
 
@@ -65,42 +111,7 @@ def main():
         with st.chat_message("assistant"):
             with st.spinner("🔍 Thinking and researching..."):
                 try:
-                    # Long memory retrieval
-                    docs = vectorstore.similarity_search(user_input, k=5)
-                    long_memory = "\n---\n".join([doc.page_content for doc in docs])
-
-                    # Web search
-                    serp_result = search.run(user_input)
-
-                    # Prompt
-                    prompt = f"""
-You are a smart, friendly AI business assistant named "BizAI".
-
-🎯 Your Goal:
-Help the user build a strong business plan by first collecting all essential details. Once sufficient info is gathered, perform a detailed **market analysis** including real-world data such as **CAGR** and competitor insights.
-
-📋 Step-by-Step Instructions:
-1. 📥 **Gather Info** (name, type, audience, USP, competitors...)
-2. 📊 **Market Analysis** (overview, audience, CAGR, trends, risks)
-3. 📌 **Suggestions** for next steps
-
-🔎 Web Search:
-{serp_result}
-
-🧠 Long-Term Context for {user_name}:
-{long_memory}
-
-💬 User Question:
-User: {user_input}
-                    """.strip()
-
-                    gemini_response = gemini_model.generate_content(prompt)
-                    response_text = gemini_response.text.strip()
-
-                    final_answer = (
-                        f"🤖 **BizAI:**\n\n{response_text}\n\n"
-                        "📌 Let me know if you'd like help drafting a section, finding suppliers, or exploring your competition."
-                    )
+                    final_answer = answer_turn(session_id, user_name, user_input)
 
                     st.markdown(final_answer)
 
@@ -110,10 +121,6 @@ User: {user_input}
                         "bot": final_answer
                     })
 
-                    vectorstore.add_documents([
-                        Document(page_content=f"User: {user_input}\nAssistant: {response_text}")
-                    ])
-
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
 
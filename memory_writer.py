@@ -0,0 +1,85 @@
+import os
+import queue
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from vector_registry import vectorstore_registry
+
+logger = logging.getLogger(__name__)
+
+# Pending turns allowed in memory, turns embedded per request, seconds to wait for a batch to fill
+MEMORY_WRITE_BACKLOG = int(os.getenv("MEMORY_WRITE_BACKLOG", "1000"))
+MEMORY_WRITE_BATCH = int(os.getenv("MEMORY_WRITE_BATCH", "32"))
+MEMORY_WRITE_INTERVAL = float(os.getenv("MEMORY_WRITE_INTERVAL", "1.0"))
+
+
+class MemoryWriter:
+    """Write-behind queue for chat turns going into the per-session vector stores.
+
+    `submit` returns immediately; a background thread groups pending turns by
+    session and stores each group with one `add_documents` call (one embedding
+    request and one commit). When the backlog is full the caller writes
+    synchronously instead, so memory stays bounded.
+    """
+
+    _STOP = object()
+
+    def __init__(self, get_store=vectorstore_registry.get, max_backlog=MEMORY_WRITE_BACKLOG,
+                 batch_size=MEMORY_WRITE_BATCH, interval=MEMORY_WRITE_INTERVAL):
+        self.get_store = get_store
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue = queue.Queue(maxsize=max_backlog)
+        self.thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, session_id, document):
+        try:
+            self.queue.put_nowait((session_id, document))
+        except queue.Full:
+            logger.warning("Memory write backlog full, writing synchronously")
+            self.get_store(session_id).add_documents([document])
+
+    def flush(self):
+        """Block until every submitted turn has been written."""
+        self.queue.join()
+
+    def shutdown(self):
+        self.queue.put(self._STOP)
+        self.thread.join()
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+            try:
+                batch.append(self.queue.get(timeout=self.interval))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is self._STOP
+            items = batch[:-1] if stopping else batch
+
+            by_session = defaultdict(list)
+            for session_id, document in items:
+                by_session[session_id].append(document)
+            for session_id, documents in by_session.items():
+                try:
+                    self.get_store(session_id).add_documents(documents)
+                except Exception:
+                    logger.exception("Failed to store %d turns for session %s", len(documents), session_id)
+
+            for _ in batch:
+                self.queue.task_done()
+            if stopping:
+                return
+
+
+memory_writer = MemoryWriter()
+# Pending turns are written out before the process exits
+atexit.register(memory_writer.shutdown)
@@ -0,0 +1,70 @@
+import os
+import time
+import shutil
+import argparse
+
+from dotenv import load_dotenv
+from langchain.vectorstores import Chroma
+
+from embedding_backends import get_embedding_backend, read_backend_marker, write_backend_marker
+from vector_registry import SHARED_MEMORY_DIR, SHARED_COLLECTION
+
+# Re-embeds the memory store with another embedding backend.
+# Usage: python migrate_embeddings.py --backend hashing
+
+load_dotenv()
+
+BATCH_SIZE = 64
+
+
+def migrate_store(persist_dir, collection, backend_name, embeddings, keep_backup=False):
+    old_store = Chroma(collection_name=collection, persist_directory=persist_dir)
+    data = old_store.get(include=["documents", "metadatas"])
+    ids, texts, metadatas = data["ids"], data["documents"], data["metadatas"]
+    del old_store
+
+    # Build the new store next to the old one, then swap directories
+    new_dir = persist_dir.rstrip(os.sep) + ".migrating"
+    shutil.rmtree(new_dir, ignore_errors=True)
+    new_store = Chroma(collection_name=collection, persist_directory=new_dir, embedding_function=embeddings)
+    for i in range(0, len(texts), BATCH_SIZE):
+        new_store.add_texts(
+            texts[i:i + BATCH_SIZE],
+            metadatas=[m or {} for m in metadatas[i:i + BATCH_SIZE]],
+            ids=ids[i:i + BATCH_SIZE],
+        )
+    del new_store
+    write_backend_marker(new_dir, backend_name)
+
+    backup_dir = persist_dir.rstrip(os.sep) + ".bak"
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    os.rename(persist_dir, backup_dir)
+    os.rename(new_dir, persist_dir)
+    if not keep_backup:
+        shutil.rmtree(backup_dir)
+    return len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed the memory.py vector store with another backend")
+    parser.add_argument("--backend", required=True, choices=["gemini", "local", "hashing"])
+    parser.add_argument("--persist-dir", default=SHARED_MEMORY_DIR)
+    parser.add_argument("--collection", default=SHARED_COLLECTION)
+    parser.add_argument("--keep-backup", action="store_true", help="keep the old store as <dir>.bak")
+    args = parser.parse_args()
+
+    current = read_backend_marker(args.persist_dir)
+    if current == args.backend:
+        print(f"⏭️  {args.persist_dir}: already on {args.backend}")
+        return
+
+    # Stop memory.py first: running apps keep the old store open
+    started = time.perf_counter()
+    embeddings = get_embedding_backend(args.backend)
+    count = migrate_store(args.persist_dir, args.collection, args.backend, embeddings, args.keep_backup)
+    print(f"✅ {args.persist_dir}: {count} turns re-embedded ({current} → {args.backend}) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
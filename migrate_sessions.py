@@ -0,0 +1,67 @@
+import os
+import time
+import shutil
+import argparse
+
+from dotenv import load_dotenv
+from langchain.vectorstores import Chroma
+
+from embedding_backends import read_backend_marker
+from vector_registry import SESSIONS_DIR, vectorstore_registry
+
+# Moves the old bizai_sessions/<session_id>/ stores into the shared collection.
+# Usage: python migrate_sessions.py [--session bharat ...] [--remove-old]
+
+load_dotenv()
+
+BATCH_SIZE = 256
+
+
+def migrate_session(session_id, persist_dir):
+    old_store = Chroma(persist_directory=persist_dir)
+    same_backend = read_backend_marker(persist_dir) == vectorstore_registry.backend
+    include = ["documents", "metadatas", "embeddings"] if same_backend else ["documents", "metadatas"]
+    data = old_store.get(include=include)
+    del old_store
+
+    ids = [f"{session_id}:{doc_id}" for doc_id in data["ids"]]
+    texts = data["documents"]
+    metadatas = data["metadatas"]
+    # Written through the session view so turns get session_id and created_at like new ones
+    view = vectorstore_registry.get(session_id)
+    prime = getattr(vectorstore_registry.embeddings, "prime", None)
+    copied = same_backend and prime is not None
+
+    for i in range(0, len(ids), BATCH_SIZE):
+        batch = slice(i, i + BATCH_SIZE)
+        if copied:
+            # Vectors were made by the same backend: seed the embedding cache with them
+            # so add_texts finds them there instead of calling the model again
+            prime(texts[batch], [[float(x) for x in e] for e in data["embeddings"][batch]])
+        view.add_texts(texts[batch], metadatas=metadatas[batch], ids=ids[batch])
+    return len(ids), copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move per-session Chroma directories into the shared collection")
+    parser.add_argument("--sessions-dir", default=SESSIONS_DIR)
+    parser.add_argument("--session", action="append", help="only migrate this session (repeatable)")
+    parser.add_argument("--remove-old", action="store_true", help="delete each old directory once migrated")
+    args = parser.parse_args()
+
+    sessions = args.session or sorted(
+        name for name in os.listdir(args.sessions_dir)
+        if os.path.isdir(os.path.join(args.sessions_dir, name))
+    )
+    for session_id in sessions:
+        persist_dir = os.path.join(args.sessions_dir, session_id)
+        started = time.perf_counter()
+        count, copied = migrate_session(session_id, persist_dir)
+        how = "copied" if copied else "re-embedded"
+        print(f"✅ {session_id}: {count} turns {how} in {time.perf_counter() - started:.1f}s")
+        if args.remove_old:
+            shutil.rmtree(persist_dir)
+
+
+if __name__ == "__main__":
+    main()
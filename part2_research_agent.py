@@ -16,6 +16,10 @@ from agents import (
 
 from pydantic import BaseModel
 
+from fact_stream import publish_fact, run_with_fact_stream
+from report_stream import stream_report
+from llm_clients import with_agents_client
+
 # Load environment variables
 load_dotenv()
 
@@ -50,11 +54,13 @@ def save_important_fact(fact: str, source: str = None) -> str:
     if "collected_facts" not in st.session_state:
         st.session_state.collected_facts = []
 
-    st.session_state.collected_facts.append({
+    saved_fact = {
         "fact": fact,
         "source": source or "Not specified",
         "timestamp": datetime.now().strftime("%H:%M:%S")
-    })
+    }
+    st.session_state.collected_facts.append(saved_fact)
+    publish_fact(saved_fact)
     return f"Fact saved: {fact}"
 
 # --- Agents ---
@@ -126,7 +132,7 @@ with st.form("business_form"):
     submitted = st.form_submit_button("Submit and Analyze")
 
 # --- Main Logic ---
-async def run_research_conversation():
+async def run_research_conversation(run_config=None):
     st.session_state.collected_facts = []
     st.session_state.research_done = False
     st.session_state.report_result = None
@@ -143,7 +149,15 @@ Revenue Strategy: {st.session_state.business_info['revenue_strategy']}
         with st.chat_message("assistant"):
             st.markdown("📋 Creating research plan...")
 
-        triage_result = await Runner.run(triage_agent, business_summary)
+        # Show each fact as soon as the research phase saves it
+        def show_fact(fact):
+            with st.chat_message("assistant"):
+                st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
+
+        triage_result = await run_with_fact_stream(
+            Runner.run(triage_agent, business_summary, run_config=run_config),
+            show_fact
+        )
 
         if hasattr(triage_result.final_output, 'topic'):
             plan = triage_result.final_output
@@ -151,21 +165,21 @@ Revenue Strategy: {st.session_state.business_info['revenue_strategy']}
                 st.markdown(f"📌 **Topic**: {plan.topic}")
                 st.json({"search_queries": plan.search_queries, "focus_areas": plan.focus_areas})
 
-        previous_fact_count = 0
-        for _ in range(10):
-            current = len(st.session_state.collected_facts)
-            if current > previous_fact_count:
-                with st.chat_message("assistant"):
-                    for fact in st.session_state.collected_facts[-(current - previous_fact_count):]:
-                        st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
-                previous_fact_count = current
-            await asyncio.sleep(1)
-
         with st.chat_message("assistant"):
             st.markdown("📝 Creating full market research report...")
 
+        # Live view of the report body while the editor agent is still writing
+        with st.chat_message("assistant"):
+            report_placeholder = st.empty()
+
         try:
-            report_result = await Runner.run(editor_agent, triage_result.to_input_list())
+            report_result = await stream_report(
+                editor_agent,
+                triage_result.to_input_list(),
+                report_placeholder.markdown,
+                run_config=run_config
+            )
+            report_placeholder.empty()
             st.session_state.report_result = report_result.final_output
 
             with st.chat_message("assistant"):
@@ -188,7 +202,7 @@ if submitted:
     }
     with st.spinner("Analyzing market..."):
         try:
-            asyncio.run(run_research_conversation())
+            asyncio.run(with_agents_client(run_research_conversation))
         except Exception as e:
             st.error(f"Unexpected error: {str(e)}")
             st.session_state.report_result = f"# Error\n\nCould not generate report.\n\n{str(e)}"
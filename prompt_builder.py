@@ -0,0 +1,151 @@
+import os
+import re
+import ast
+import math
+from collections import Counter
+
+from context_window import count_tokens
+
+# Token budget for search snippets plus memory turns (the fixed instructions come on top)
+PROMPT_CONTEXT_TOKENS = int(os.getenv("PROMPT_CONTEXT_TOKENS", "1500"))
+# Part of that budget reserved for search snippets; whatever one side leaves unused goes to the other
+PROMPT_SEARCH_SHARE = float(os.getenv("PROMPT_SEARCH_SHARE", "0.6"))
+# Snippets or turns at least this similar (word Jaccard) to one already picked are dropped
+PROMPT_DUPLICATE_THRESHOLD = float(os.getenv("PROMPT_DUPLICATE_THRESHOLD", "0.8"))
+# Most recent memory turns always given room, whatever their relevance ("Yes" needs the last answer)
+PROMPT_RECENT_TURNS = int(os.getenv("PROMPT_RECENT_TURNS", "2"))
+# Smallest piece worth keeping when a snippet or turn is cut down to the budget left
+PROMPT_MIN_TRUNCATED_TOKENS = int(os.getenv("PROMPT_MIN_TRUNCATED_TOKENS", "20"))
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "was", "be",
+    "i", "you", "my", "me", "it", "this", "that", "what", "how", "can", "do", "does", "at", "by",
+    "as", "from", "your", "we", "our", "will", "would", "should", "about", "want", "please",
+}
+
+
+def words(text):
+    return [w for w in re.findall(r"[a-z0-9$%.]+", text.lower()) if w not in STOPWORDS and w.strip(".")]
+
+
+def split_snippets(search_result):
+    """Breaks a search tool's result string into separate snippets."""
+    text = (search_result or "").strip()
+    if text.startswith("["):
+        # SerpAPIWrapper returns str(list) when it only has organic snippets
+        try:
+            items = ast.literal_eval(text)
+            if isinstance(items, list):
+                return [str(item).strip() for item in items if str(item).strip()]
+        except (ValueError, SyntaxError):
+            pass
+    return [part.strip() for part in re.split(r"\n\s*\n|\n", text) if part.strip()]
+
+
+def rank(query, candidates, prefer_recent=False):
+    """Candidates ordered by tf-idf overlap with `query`, best first.
+
+    Ties keep list order, or go to the later candidate with `prefer_recent`.
+    """
+    query_words = set(words(query))
+    docs = [Counter(words(c)) for c in candidates]
+    df = Counter(w for doc in docs for w in doc)
+    n = len(docs)
+
+    def score(doc):
+        length = sum(doc.values()) or 1
+        return sum(doc[w] / length * math.log(1 + n / df[w]) for w in query_words if w in doc)
+
+    scores = [score(doc) for doc in docs]
+    return sorted(range(len(candidates)), key=lambda i: (-scores[i], -i if prefer_recent else i))
+
+
+def truncate(text, max_tokens):
+    """`text` cut down to at most `max_tokens` tokens, ending in an ellipsis."""
+    cut = len(text)
+    while cut > 0 and count_tokens(text[:cut].rstrip() + " …") > max_tokens:
+        # Shrink in proportion to the overshoot, by at least one character
+        cut = min(cut - 1, cut * max_tokens // count_tokens(text[:cut].rstrip() + " …"))
+    return text[:cut].rstrip() + " …" if cut > 0 else ""
+
+
+def is_duplicate(text, picked):
+    new = set(words(text))
+    if not new:
+        return True
+    for other in picked:
+        old = set(words(other))
+        if old and len(new & old) / len(new | old) >= PROMPT_DUPLICATE_THRESHOLD:
+            return True
+    return False
+
+
+def fill(query, candidates, budget, keep_last=0):
+    """Best-ranked, non-duplicate candidates that fit in `budget` tokens, plus tokens used.
+
+    With `keep_last`, the last candidates go in first (newest first) and ties go
+    to later ones, for chat turns. A candidate bigger than the budget left is
+    cut down to it rather than skipped.
+    """
+    recent = list(range(len(candidates) - 1, max(len(candidates) - keep_last, 0) - 1, -1))
+    order = recent + [i for i in rank(query, candidates, prefer_recent=keep_last > 0) if i not in recent]
+
+    picked, used = {}, 0
+    for i in order:
+        text = candidates[i]
+        if is_duplicate(text, picked.values()):
+            continue
+        left = budget - used - 1
+        if count_tokens(text) > left:
+            if left < PROMPT_MIN_TRUNCATED_TOKENS:
+                continue
+            text = truncate(text, left)
+        picked[i] = text
+        used += count_tokens(text) + 1
+    return picked, used
+
+
+class PromptBuilder:
+    """Fills a prompt template's search and memory slots within a token budget.
+
+    Snippets and memory turns are ranked by relevance to the user's question,
+    near-duplicates are dropped, and the best ones are added until the budget
+    runs out. The last `recent_turns` turns always get room first. Picked
+    snippets stay in rank order and picked turns in chronological order.
+    """
+
+    def __init__(self, max_tokens=PROMPT_CONTEXT_TOKENS, search_share=PROMPT_SEARCH_SHARE,
+                 recent_turns=PROMPT_RECENT_TURNS):
+        self.max_tokens = max_tokens
+        self.search_share = search_share
+        self.recent_turns = recent_turns
+
+    def build(self, template, user_input, snippets, turns, empty="None"):
+        search_budget = int(self.max_tokens * self.search_share)
+        memory_budget = self.max_tokens - search_budget
+
+        # Whichever side needs less lends the rest of its share to the other
+        snippet_tokens = sum(count_tokens(s) + 1 for s in snippets)
+        turn_tokens = sum(count_tokens(t) + 1 for t in turns)
+        if snippet_tokens < search_budget:
+            memory_budget += search_budget - snippet_tokens
+            search_budget = snippet_tokens
+        elif turn_tokens < memory_budget:
+            search_budget += memory_budget - turn_tokens
+            memory_budget = turn_tokens
+
+        picked_snippets, _ = fill(user_input, snippets, search_budget)
+        picked_turns, _ = fill(user_input, turns, memory_budget, keep_last=self.recent_turns)
+
+        search_text = "\n".join(f"- {s}" for s in picked_snippets.values()) or empty
+        memory_text = "\n\n".join(picked_turns[i] for i in sorted(picked_turns)) or empty
+        prompt = template.format(search=search_text, memory=memory_text, user_input=user_input).strip()
+
+        stats = {
+            "prompt_tokens": count_tokens(prompt),
+            "snippets": f"{len(picked_snippets)}/{len(snippets)}",
+            "turns": f"{len(picked_turns)}/{len(turns)}",
+        }
+        print(f"Prompt tokens this turn: {stats['prompt_tokens']} "
+              f"(snippets {stats['snippets']}, memory turns {stats['turns']}, context budget {self.max_tokens})")
+        return prompt, stats
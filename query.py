@@ -1,10 +1,10 @@
-from openai import OpenAI
+from llm_clients import openai_client
 import os
 from dotenv import load_dotenv
 
 # Load API key
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = openai_client(os.getenv("OPENAI_API_KEY"))
 
 # Initial setup
 messages = [
@@ -0,0 +1,222 @@
+import os
+import re
+import time
+import uuid
+import random
+import asyncio
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Token buckets shared by every process on this machine (uvicorn services and
+# Streamlit apps alike), so together they stay under each provider's rate limit.
+# Limits are requests per minute plus a burst size, per provider and optionally per model:
+#   QUOTA_OPENAI_RPM=500  QUOTA_OPENAI_BURST=50  QUOTA_OPENAI_GPT_4_RPM=200
+QUOTA_ENABLED = os.getenv("QUOTA_ENABLED", "1") == "1"
+QUOTA_DB_PATH = os.getenv("QUOTA_DB_PATH", os.path.join("bizai_cache", "quota.sqlite3"))
+# Longest a caller waits for a token before giving up
+QUOTA_MAX_WAIT = float(os.getenv("QUOTA_MAX_WAIT", "120"))
+# Part of each bucket that batch work may not use, kept for interactive requests
+QUOTA_BATCH_RESERVE = float(os.getenv("QUOTA_BATCH_RESERVE", "0.2"))
+
+DEFAULT_LIMITS = {
+    "openai": (500, 50),
+    "gemini": (300, 30),
+    "serpapi": (60, 10),
+    "tavily": (60, 10),
+}
+
+INTERACTIVE = 0
+BATCH = 1
+
+# Waiters that stopped refreshing this long ago belong to a dead process
+WAITER_STALE_AFTER = 10
+POLL_INTERVAL = 0.5
+
+current_priority = ContextVar(
+    "quota_priority", default=BATCH if os.getenv("QUOTA_PRIORITY") == "batch" else INTERACTIVE
+)
+
+
+class QuotaTimeout(TimeoutError):
+    pass
+
+
+@contextmanager
+def priority(level):
+    """Requests made inside this block (and tasks started from it) use `level`."""
+    token = current_priority.set(level)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+def _env_name(*parts):
+    return "QUOTA_" + "_".join(re.sub(r"[^A-Za-z0-9]+", "_", p).strip("_").upper() for p in parts)
+
+
+def bucket_limits(provider, model=None):
+    """(requests per minute, burst) for a provider, or one of its models."""
+    rpm, burst = DEFAULT_LIMITS.get(provider, (60, 10))
+    rpm = float(os.getenv(_env_name(provider, "RPM"), rpm))
+    burst = float(os.getenv(_env_name(provider, "BURST"), burst))
+    if model:
+        rpm = float(os.getenv(_env_name(provider, model, "RPM"), rpm))
+        burst = float(os.getenv(_env_name(provider, model, "BURST"), burst))
+    return rpm, max(1.0, burst)
+
+
+class QuotaScheduler:
+    """Cross-process token buckets in SQLite, with interactive work ahead of batch.
+
+    Each bucket refills at its per-minute rate up to its burst size. Taking a
+    token happens in a `BEGIN IMMEDIATE` transaction, so processes never hand
+    out the same token twice. Callers that find the bucket empty wait for the
+    next refill instead of hitting the provider and retrying on 429. Batch
+    callers also wait while an interactive caller is queued on the bucket, or
+    when taking a token would dip into the interactive reserve.
+    """
+
+    def __init__(self, path=QUOTA_DB_PATH, enabled=QUOTA_ENABLED, max_wait=QUOTA_MAX_WAIT,
+                 batch_reserve=QUOTA_BATCH_RESERVE):
+        self.path = path
+        self.enabled = enabled
+        self.max_wait = max_wait
+        self.batch_reserve = batch_reserve
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS quota_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS quota_waiters (
+                    id TEXT PRIMARY KEY,
+                    bucket TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    heartbeat REAL NOT NULL
+                )
+            """)
+        return self._conn
+
+    def try_acquire(self, provider, model=None, cost=1, level=INTERACTIVE, waiter_id=None):
+        """Takes `cost` tokens if allowed; otherwise returns the seconds to wait before trying again."""
+        name = f"{provider}:{model}" if model else provider
+        rpm, capacity = bucket_limits(provider, model)
+        rate = rpm / 60
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM quota_buckets WHERE name = ?", (name,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+
+                floor = 0.0
+                if level == BATCH:
+                    floor = capacity * self.batch_reserve
+                    interactive_waiting = conn.execute(
+                        "SELECT 1 FROM quota_waiters WHERE bucket = ? AND priority = ? AND heartbeat > ? LIMIT 1",
+                        (name, INTERACTIVE, now - WAITER_STALE_AFTER)
+                    ).fetchone()
+                    if interactive_waiting:
+                        floor = capacity
+
+                if tokens - cost >= floor:
+                    tokens -= cost
+                    wait = 0.0
+                    if waiter_id:
+                        conn.execute("DELETE FROM quota_waiters WHERE id = ?", (waiter_id,))
+                else:
+                    wait = max((cost + floor - tokens) / rate, 0.01) if rate else POLL_INTERVAL
+                    if waiter_id:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO quota_waiters (id, bucket, priority, heartbeat) VALUES (?, ?, ?, ?)",
+                            (waiter_id, name, level, now)
+                        )
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO quota_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                    (name, tokens, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def _forget(self, waiter_id):
+        with self._lock:
+            self._connect().execute("DELETE FROM quota_waiters WHERE id = ?", (waiter_id,))
+
+    def _next_sleep(self, wait, deadline, provider):
+        if time.monotonic() + min(wait, POLL_INTERVAL) > deadline:
+            raise QuotaTimeout(f"No {provider} quota available within {self.max_wait:g}s")
+        # Poll at least every POLL_INTERVAL so a freed-up interactive slot is noticed,
+        # with jitter so waiting processes do not wake in lockstep
+        return min(wait, POLL_INTERVAL) * random.uniform(0.8, 1.2)
+
+    def acquire(self, provider, model=None, cost=1, level=None):
+        """Blocks until the bucket for `provider` (and `model`) grants `cost` tokens."""
+        if not self.enabled:
+            return
+        level = current_priority.get() if level is None else level
+        waiter_id = uuid.uuid4().hex
+        deadline = time.monotonic() + self.max_wait
+        try:
+            while True:
+                wait = self.try_acquire(provider, model, cost, level, waiter_id)
+                if wait == 0:
+                    return
+                time.sleep(self._next_sleep(wait, deadline, provider))
+        except BaseException:
+            self._forget(waiter_id)
+            raise
+
+    async def acquire_async(self, provider, model=None, cost=1, level=None):
+        if not self.enabled:
+            return
+        level = current_priority.get() if level is None else level
+        waiter_id = uuid.uuid4().hex
+        deadline = time.monotonic() + self.max_wait
+        try:
+            while True:
+                wait = await asyncio.to_thread(self.try_acquire, provider, model, cost, level, waiter_id)
+                if wait == 0:
+                    return
+                await asyncio.sleep(self._next_sleep(wait, deadline, provider))
+        except BaseException:
+            await asyncio.to_thread(self._forget, waiter_id)
+            raise
+
+    def stats(self):
+        with self._lock:
+            rows = self._connect().execute("SELECT name, tokens, updated_at FROM quota_buckets").fetchall()
+        now = time.time()
+        stats = {}
+        for name, tokens, updated_at in rows:
+            provider, _, model = name.partition(":")
+            rpm, capacity = bucket_limits(provider, model or None)
+            stats[name] = {
+                "tokens": round(min(capacity, tokens + (now - updated_at) * rpm / 60), 2),
+                "capacity": capacity,
+                "rpm": rpm,
+            }
+        return stats
+
+
+quota = QuotaScheduler()
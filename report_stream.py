@@ -0,0 +1,80 @@
+import re
+import json
+import time
+
+from agents import Runner
+from openai.types.responses import ResponseTextDeltaEvent
+
+# How often (in seconds) the partial report is re-rendered while streaming
+RENDER_INTERVAL = 0.15
+
+
+def partial_json_string(buffer, field):
+    """Decode the (possibly unfinished) string value of `field` from streamed JSON.
+
+    Returns None until the field has started.
+    """
+    match = re.search(r'(?<!\\)"' + re.escape(field) + r'"\s*:\s*"', buffer)
+    if not match:
+        return None
+
+    raw = []
+    i = match.end()
+    while i < len(buffer):
+        char = buffer[i]
+        if char == '"':
+            break
+        if char == "\\":
+            # Stop before an escape sequence that has not fully arrived yet
+            if i + 1 >= len(buffer):
+                break
+            if buffer[i + 1] == "u":
+                if i + 6 > len(buffer):
+                    break
+                raw.append(buffer[i:i + 6])
+                i += 6
+                continue
+            raw.append(buffer[i:i + 2])
+            i += 2
+            continue
+        raw.append(char)
+        i += 1
+
+    value = json.loads('"' + "".join(raw) + '"')
+    # Hold back the first half of a \u surrogate pair until the second arrives
+    if value and "\ud800" <= value[-1] <= "\udbff":
+        value = value[:-1]
+    return value
+
+
+async def stream_report(agent, agent_input, on_report, field="report", run_config=None):
+    """Run `agent` with `Runner.run_streamed`, passing the report body to `on_report` as it grows.
+
+    Agents with a structured `output_type` stream JSON, so the `field` value is
+    decoded on the fly; plain-text agents stream the markdown directly. The
+    finished run result is returned, with the usual structured `final_output`.
+    """
+    result = Runner.run_streamed(agent, agent_input, run_config=run_config)
+    structured = agent.output_type is not None
+
+    buffer = ""
+    shown = ""
+    last_render = 0.0
+    async for event in result.stream_events():
+        if event.type != "raw_response_event" or not isinstance(event.data, ResponseTextDeltaEvent):
+            continue
+
+        buffer += event.data.delta
+        # Decoding rescans the whole buffer, so only do it when a render is due
+        if time.monotonic() - last_render < RENDER_INTERVAL:
+            continue
+        report = partial_json_string(buffer, field) if structured else buffer
+        if report and report != shown:
+            on_report(report)
+            shown = report
+            last_render = time.monotonic()
+
+    report = getattr(result.final_output, field, None) if structured else result.final_output
+    if report and report != shown:
+        on_report(str(report))
+    return result
@@ -16,6 +16,10 @@ from agents import (
 
 from pydantic import BaseModel
 
+from fact_stream import publish_fact, run_with_fact_stream
+from report_stream import stream_report
+from llm_clients import with_agents_client
+
 # Load environment variables
 load_dotenv()
 
@@ -68,11 +72,13 @@ def save_important_fact(fact: str, source: str = None) -> str:
     if "collected_facts" not in st.session_state:
         st.session_state.collected_facts = []
     
-    st.session_state.collected_facts.append({
+    saved_fact = {
         "fact": fact,
         "source": source or "Not specified",
         "timestamp": datetime.now().strftime("%H:%M:%S")
-    })
+    }
+    st.session_state.collected_facts.append(saved_fact)
+    publish_fact(saved_fact)
     
     return f"Fact saved: {fact}"
 
@@ -163,7 +169,7 @@ if "report_result" not in st.session_state:
     st.session_state.report_result = None
 
 # Main research function
-async def run_research(topic):
+async def run_research(topic, run_config=None):
     # Reset state for new research
     st.session_state.collected_facts = []
     st.session_state.research_done = False
@@ -171,6 +177,10 @@ async def run_research(topic):
     
     with tab1:
         message_container = st.container()
+
+    # Live view of the report body while the editor agent is still writing
+    with tab2:
+        report_placeholder = st.empty()
         
     # Create error handling container
     error_container = st.empty()
@@ -181,9 +191,22 @@ async def run_research(topic):
         with message_container:
             st.write("🔍 **Triage Agent**: Planning research approach...")
         
-        triage_result = await Runner.run(
-            triage_agent,
-            f"Research this topic thoroughly: {topic}. This research will be used to create a comprehensive research report."
+        # Display facts as they're collected, while the triage/research phase runs
+        fact_placeholder = message_container.empty()
+
+        def show_fact(new_fact):
+            with fact_placeholder.container():
+                st.write("📚 **Collected Facts**:")
+                for fact in st.session_state.collected_facts:
+                    st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
+
+        triage_result = await run_with_fact_stream(
+            Runner.run(
+                triage_agent,
+                f"Research this topic thoroughly: {topic}. This research will be used to create a comprehensive research report.",
+                run_config=run_config
+            ),
+            show_fact
         )
         
         # Check if the result is a ResearchPlan object or a string
@@ -207,29 +230,16 @@ async def run_research(topic):
             st.write("📋 **Research Plan**:")
             st.json(plan_display)
         
-        # Display facts as they're collected
-        fact_placeholder = message_container.empty()
-        
-        # Check for new facts periodically
-        previous_fact_count = 0
-        for i in range(15):  # Check more times to allow for more comprehensive research
-            current_facts = len(st.session_state.collected_facts)
-            if current_facts > previous_fact_count:
-                with fact_placeholder.container():
-                    st.write("📚 **Collected Facts**:")
-                    for fact in st.session_state.collected_facts:
-                        st.info(f"**Fact**: {fact['fact']}\n\n**Source**: {fact['source']}")
-                previous_fact_count = current_facts
-            await asyncio.sleep(1)
-        
         # Editor Agent phase
         with message_container:
             st.write("📝 **Editor Agent**: Creating comprehensive research report...")
         
         try:
-            report_result = await Runner.run(
+            report_result = await stream_report(
                 editor_agent,
-                triage_result.to_input_list()
+                triage_result.to_input_list(),
+                report_placeholder.markdown,
+                run_config=run_config
             )
             
             st.session_state.report_result = report_result.final_output
@@ -260,13 +270,15 @@ async def run_research(topic):
                         st.write("⚠️ **Research completed but there was an issue generating the structured report.**")
                         st.write("Raw research results are available in the Report tab.")
     
+    # The Report tab renders the finished report below, so drop the live view
+    report_placeholder.empty()
     st.session_state.research_done = True
 
 # Run the research when the button is clicked
 if start_button:
     with st.spinner(f"Researching: {user_topic}"):
         try:
-            asyncio.run(run_research(user_topic))
+            asyncio.run(with_agents_client(run_research, user_topic))
         except Exception as e:
             st.error(f"An error occurred during research: {str(e)}")
             # Set a basic report result so the user gets something
@@ -0,0 +1,107 @@
+import os
+import asyncio
+from types import SimpleNamespace
+
+from agents import Runner
+
+from report_stream import stream_report
+
+# The research steps of cometitve.py that do not touch the UI
+
+# Maximum number of research_agent runs allowed in flight at once
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "5"))
+
+
+# Research a single search query with its own research_agent run
+async def research_query(research_agent, query, semaphore, run_config=None):
+    async with semaphore:
+        result = await Runner.run(research_agent, query, run_config=run_config)
+        return str(result.final_output)
+
+# Run research_agent once per plan query concurrently, keeping plan order
+async def execute_research_plan(research_agent, search_queries, max_concurrency=RESEARCH_CONCURRENCY,
+                                run_config=None):
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    results = await asyncio.gather(
+        *(research_query(research_agent, query, semaphore, run_config) for query in search_queries),
+        return_exceptions=True
+    )
+
+    summaries = []
+    for query, result in zip(search_queries, results):
+        if isinstance(result, Exception):
+            result = f"Research failed for this query: {result}"
+        summaries.append({"query": query, "summary": result})
+    return summaries
+
+# Merge the per-query summaries into a single input for the writing agent
+def build_editor_input(topic, research_plan, summaries):
+    sections = "\n\n".join(
+        f"### {i+1}. {item['query']}\n{item['summary']}"
+        for i, item in enumerate(summaries)
+    )
+    focus_areas = "\n".join(f"- {area}" for area in research_plan.focus_areas)
+    return f"""
+Original query: {topic}
+
+Research topic: {research_plan.topic}
+
+Focus areas:
+{focus_areas}
+
+Initial research (one summary per search query, in plan order):
+
+{sections}
+""".strip()
+
+
+class ResearchRun:
+    """One triage -> parallel research -> streamed report run, as cometitve.py and benchmark.py do it.
+
+    Each step's output is kept on the instance as soon as it exists, so a caller
+    can still show the research summaries when the report step fails.
+    """
+
+    def __init__(self, topic, plan_type=SimpleNamespace):
+        self.topic = topic
+        self.plan_type = plan_type
+        self.triage_result = None
+        self.plan = None
+        self.summaries = None
+        self.report_result = None
+
+    async def run(self, triage_agent, research_agent, editor_agent, on_report,
+                  on_plan=None, watch_research=None, on_summaries=None, run_config=None):
+        """Runs every step; the hooks let a UI show progress.
+
+        on_plan(plan) after triage, watch_research(coro) wraps the research step
+        (e.g. to stream facts while it runs), on_summaries(summaries) after it,
+        and on_report(text) with the report body as it streams.
+        """
+        self.triage_result = await Runner.run(
+            triage_agent,
+            f"Research this topic thoroughly: {self.topic}. This research will be used to create a comprehensive research report.",
+            run_config=run_config
+        )
+        if hasattr(self.triage_result.final_output, 'topic'):
+            self.plan = self.triage_result.final_output
+        else:
+            # Fallback if we don't get the expected output type
+            self.plan = self.plan_type(
+                topic=self.topic,
+                search_queries=["Researching " + self.topic],
+                focus_areas=["General information about " + self.topic]
+            )
+        if on_plan:
+            on_plan(self.plan)
+
+        research = execute_research_plan(research_agent, self.plan.search_queries, run_config=run_config)
+        self.summaries = await (watch_research(research) if watch_research else research)
+        if on_summaries:
+            on_summaries(self.summaries)
+
+        self.report_result = await stream_report(
+            editor_agent, build_editor_input(self.topic, self.plan, self.summaries), on_report,
+            run_config=run_config
+        )
+        return self.report_result
@@ -1,6 +1,13 @@
-from fastapi import FastAPI
-import requests
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
+from llm_clients import gemini_client
+from quota import BATCH, priority
+from summary_pool import chunk_messages, summarize_chunks
+from single_flight import AsyncSingleFlight
+from summary_store import chunk_hash
+from backend_client import BackendClient
 import os
 from dotenv import load_dotenv
 import uvicorn
@@ -8,11 +15,21 @@ import uvicorn
 # Load Gemini API key
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled backend client per worker, closed on shutdown
+    app.state.backend = BackendClient()
+    yield
+    await app.state.backend.aclose()
 
-def summarize_chunk(messages_chunk):
+app = FastAPI(lifespan=lifespan)
+
+# Identical requests in flight at once (frontend retries, several tabs) share one run
+summary_flight = AsyncSingleFlight()
+
+async def summarize_chunk(messages_chunk):
     chat_text = ""
     for msg in messages_chunk:
         role = "User" if msg.get("isUser") else "Assistant"
@@ -24,18 +41,19 @@ You are a helpful summarization assistant.
 Summarize this short chat exchange in 1-2 sentences:
 {chat_text}
 """
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        return f"❌ Error summarizing chunk: {e}"
+    # Summaries are batch work: interactive chat gets the Gemini quota first
+    with priority(BATCH):
+        response = await gemini_model.generate_content_async(prompt)
+    return response.text.strip()
 
 @app.get("/summarize_chunks/{clerk_id}/{project_id}")
-def summarize_chat_in_chunks(clerk_id: str, project_id: str):
+async def summarize_chat_in_chunks(clerk_id: str, project_id: str, request: Request):
+    return await summarize_project_chunks(clerk_id, project_id, request.app.state.backend)
+
+async def summarize_project_chunks(clerk_id, project_id, backend):
     try:
         # Fetch full message list
-        url = f"http://192.168.1.64:5000/api/v1/chats/{clerk_id}/{project_id}/executive_summary"
-        response = requests.get(url)
+        response = await backend.get_executive_summary(clerk_id, project_id)
 
         if response.status_code != 200:
             return {"error": f"Failed to fetch data. Status: {response.status_code}"}
@@ -46,23 +64,26 @@ def summarize_chat_in_chunks(clerk_id: str, project_id: str):
         if not messages:
             return {"summary_chunks": [], "message": "No messages found."}
 
-        # Break into chunks of 2
-        summary_chunks = []
-        for i in range(0, len(messages), 2):
-            chunk = messages[i:i+2]
-            if chunk:
-                summary = summarize_chunk(chunk)
-                summary_chunks.append(summary)
-
-        return {
-            "project_id": project_id,
-            "clerk_id": clerk_id,
-            "summary_chunks": summary_chunks,
-            "total_chunks": len(summary_chunks)
-        }
+        # Only callers that read the same messages share a run
+        return await summary_flight.do(
+            ("summarize_chunks", clerk_id, project_id, chunk_hash(messages)),
+            summarize_messages, clerk_id, project_id, messages
+        )
 
     except Exception as e:
         return {"error": str(e)}
 
+async def summarize_messages(clerk_id, project_id, messages):
+    # Break into chunks of 2 and summarize them concurrently, keeping order
+    summaries = await summarize_chunks(chunk_messages(messages, 2), summarize_chunk)
+    summary_chunks = [summary.text for summary in summaries]
+
+    return {
+        "project_id": project_id,
+        "clerk_id": clerk_id,
+        "summary_chunks": summary_chunks,
+        "total_chunks": len(summary_chunks)
+    }
+
 if __name__ == "__main__":
     uvicorn.run("s:app", host="0.0.0.0", port=8000, reload=True)
@@ -2,13 +2,16 @@
 
 from dotenv import load_dotenv
 from langgraph.graph import StateGraph, END
+from langgraph.graph.message import add_messages
 from typing import TypedDict, Annotated
-import operator
 from langchain_core.messages import AnyMessage, SystemMessage, HumanMessage, ToolMessage
-from langchain_openai import ChatOpenAI
+from llm_clients import chat_openai
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.utilities import SerpAPIWrapper
 from langchain_core.tools import Tool
+from context_window import ContextWindow
+from tool_runner import execute_tool_calls
+from search_cache import CachedSearch, cached_tool
 import time
 
 # Load environment variables
@@ -17,21 +20,23 @@ load_dotenv()
 # Wrap SerpAPI as a LangChain Tool manually
 serp_tool = Tool(
     name="serp_search",
-    func=SerpAPIWrapper().run,
+    func=CachedSearch(SerpAPIWrapper(), "serpapi").run,
     description="Use this tool to perform web searches via SerpAPI."
 )
 
 # Initialize the Tavily search tool
-search_tool_tavily = TavilySearchResults(max_results=5)
+search_tool_tavily = cached_tool(TavilySearchResults(max_results=5), "tavily")
 
 # Agent state definition
 class AgentState(TypedDict):
-    messages: Annotated[list[AnyMessage], operator.add]
+    # add_messages gives every message an ID, so repeated messages can be recognised
+    messages: Annotated[list[AnyMessage], add_messages]
 
 # Agent class for business planning and market research
 class MarketResearchAgent:
     def __init__(self, model, tools, system_prompt=""):
         self.system = system_prompt
+        self.context = ContextWindow()
         graph = StateGraph(AgentState)
         graph.add_node("llm", self.call_model)
         graph.add_node("action", self.execute_tools)
@@ -46,23 +51,23 @@ class MarketResearchAgent:
         return len(state['messages'][-1].tool_calls) > 0
 
     def call_model(self, state: AgentState):
-        messages = state['messages']
+        messages = self.context.prepare(state['messages'], self.system)
         if self.system:
             messages = [SystemMessage(content=self.system)] + messages
         response = self.model.invoke(messages)
+        self.context.report(response, self.context.total_tokens(messages))
         return {'messages': [response]}
 
+    def run_tool(self, call):
+        print(f"Calling: {call}")
+        if call['name'] not in self.tools:
+            return "Tool not found, please retry."
+        return self.tools[call['name']].invoke(call['args'])
+
     def execute_tools(self, state: AgentState):
         tool_calls = state['messages'][-1].tool_calls
-        results = []
-        for call in tool_calls:
-            print(f"Calling: {call}")
-            if call['name'] not in self.tools:
-                result = "Tool not found, please retry."
-            else:
-                result = self.tools[call['name']].invoke(call['args'])
-            results.append(ToolMessage(tool_call_id=call['id'], name=call['name'], content=str(result)))
-        return {'messages': results}
+        # Independent calls run concurrently; results keep the tool_calls order
+        return {'messages': execute_tool_calls(tool_calls, self.run_tool)}
 
 # System prompt for business planning
 system_prompt = """
@@ -75,7 +80,7 @@ Only when you have enough information, say: 'Here is your market analysis summar
 """
 
 # Initialize model and agent
-llm_model = ChatOpenAI(model="gpt-4")
+llm_model = chat_openai("gpt-4")
 agent = MarketResearchAgent(llm_model, [search_tool_tavily, serp_tool], system_prompt=system_prompt)
 
 # Interactive conversation loop
@@ -98,8 +103,8 @@ def interactive_market_research():
 
         # Get user input for next turn
         user_input = input("👤: ")
-        conversation.append(HumanMessage(content=user_input))
-        conversation.extend(result['messages'])
+        # result['messages'] already holds the whole conversation so far
+        conversation = result['messages'] + [HumanMessage(content=user_input)]
 
 if __name__ == "__main__":
     interactive_market_research()
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from langchain_core.tools import StructuredTool
+
+from sqlite_cache import SQLiteCache, make_key
+from quota import quota
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached result stays valid, per provider
+PROVIDER_TTLS = {
+    "serpapi": int(os.getenv("SERPAPI_CACHE_TTL", str(6 * 3600))),
+    "tavily": int(os.getenv("TAVILY_CACHE_TTL", str(6 * 3600))),
+}
+
+# Shared by every script and service that searches the web
+search_cache = SQLiteCache(
+    os.getenv("SEARCH_CACHE_PATH", os.path.join("bizai_cache", "search_cache.sqlite3")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+)
+
+
+# Identical searches already running (another session, tab or retry) are waited on, not repeated
+search_flight = SingleFlight()
+
+# Lives as long as the process so Streamlit reruns reuse the same threads
+search_pool = ThreadPoolExecutor(max_workers=int(os.getenv("SEARCH_POOL_SIZE", "8")))
+
+
+def normalize_query(query):
+    return " ".join(str(query).lower().split())
+
+
+def provider_params(search, provider):
+    """Settings that change what a provider returns, so they are part of the key."""
+    if provider == "serpapi":
+        return dict(getattr(search, "params", {}) or {})
+    if provider == "tavily":
+        return {"max_results": getattr(search, "max_results", None)}
+    return {}
+
+
+class CachedSearch:
+    """Wraps a SerpAPIWrapper or TavilySearchResults so `.run` goes through the shared cache."""
+
+    def __init__(self, search, provider, cache=search_cache, ttl=None):
+        self.search = search
+        self.provider = provider
+        self.cache = cache
+        self.ttl = PROVIDER_TTLS.get(provider) if ttl is None else ttl
+        self.params = provider_params(search, provider)
+
+    def run(self, query):
+        key = make_key(self.provider, normalize_query(query), self.params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        return search_flight.do(key, self.fetch, key, query)
+
+    def fetch(self, key, query):
+        quota.acquire(self.provider)
+        result = self.search.run(query)
+        # Tavily reports failures as a plain string instead of raising
+        if self.provider == "tavily" and isinstance(result, str):
+            return result
+        self.cache.set(key, json.dumps(result), ttl=self.ttl, namespace=self.provider)
+        return result
+
+
+def cached_tool(tool, provider):
+    """Same LangChain tool (name, description, args) with its searches cached."""
+    cached = CachedSearch(tool, provider)
+    return StructuredTool.from_function(
+        func=cached.run,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+    )
+
+
+def run_searches(query, searches):
+    """Query several providers at once; `searches` maps name -> (search, timeout seconds).
+
+    Returns name -> result. Providers that fail or miss their own deadline map to
+    None instead of failing the caller; a late result still lands in the cache.
+    """
+    started = time.monotonic()
+    futures = {
+        name: (search_pool.submit(search.run, query), timeout)
+        for name, (search, timeout) in searches.items()
+    }
+
+    results = {}
+    for name, (future, timeout) in futures.items():
+        remaining = max(0.0, started + timeout - time.monotonic())
+        try:
+            results[name] = future.result(timeout=remaining)
+        except TimeoutError:
+            logger.warning("%s search timed out after %.1fs, skipping", name, timeout)
+            results[name] = None
+        except Exception as e:
+            logger.warning("%s search failed, skipping: %s", name, e)
+            results[name] = None
+    return results
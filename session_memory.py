@@ -0,0 +1,119 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from context_window import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Background summarization runs here, never on the user's turn
+summary_pool = ThreadPoolExecutor(max_workers=int(os.getenv("SUMMARY_MEMORY_WORKERS", "4")),
+                                  thread_name_prefix="summary-memory")
+
+SUMMARY_PROMPT = """Progressively summarize the lines of conversation provided, adding onto the previous summary and returning a new summary.
+Keep every concrete business detail (name, type, audience, location, USP, competitors, pricing, decisions).
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{new_lines}
+
+New summary:"""
+
+
+class SessionSummaryMemory:
+    """Summary-buffer memory for one chat session, summarized off the critical path.
+
+    Recent messages are kept verbatim. Once they exceed `max_token_limit`, the
+    older ones are folded into the running summary by a background LLM call;
+    until that finishes, `context()` keeps using the last completed summary.
+    """
+
+    def __init__(self, llm, max_token_limit=500, keep_messages=2):
+        self.llm = llm
+        self.max_token_limit = max_token_limit
+        self.keep_messages = keep_messages
+        self.summary = ""
+        self.messages = []
+        self.pending = None
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def add_user_message(self, text):
+        self._add("User", text)
+
+    def add_ai_message(self, text):
+        self._add("Assistant", text)
+
+    def _add(self, role, text):
+        with self._lock:
+            self.messages.append(f"{role}: {text}")
+            self._maybe_summarize()
+
+    def _maybe_summarize(self):
+        if self.pending is not None:
+            return
+        if sum(count_tokens(m) for m in self.messages) <= self.max_token_limit:
+            return
+        fold = self.messages[:-self.keep_messages] if self.keep_messages else list(self.messages)
+        if fold:
+            self.pending = summary_pool.submit(self._summarize, self.summary, fold, self.generation)
+
+    def _summarize(self, summary, fold, generation):
+        try:
+            prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", new_lines="\n".join(fold))
+            new_summary = self.llm.invoke(prompt).content.strip()
+        except Exception as e:
+            # Not retried here: the next message added tries again
+            logger.warning("Summarizing %d messages failed: %s", len(fold), e)
+            with self._lock:
+                self.pending = None
+            return
+
+        with self._lock:
+            self.pending = None
+            if generation != self.generation:
+                return
+            # Only the folded messages leave the buffer; newer ones arrived meanwhile
+            self.summary = new_summary
+            self.messages = self.messages[len(fold):]
+            self._maybe_summarize()
+
+    def context(self):
+        with self._lock:
+            parts = []
+            if self.summary:
+                parts.append(f"Summary of earlier conversation:\n{self.summary}")
+            if self.messages:
+                parts.append("\n".join(self.messages))
+            return "\n\n".join(parts)
+
+    def clear(self):
+        with self._lock:
+            self.summary = ""
+            self.messages = []
+            self.generation += 1
+
+
+class SessionMemoryManager:
+    """One `SessionSummaryMemory` per session, LRU-bounded."""
+
+    def __init__(self, llm, max_token_limit=500, max_sessions=1000):
+        self.llm = llm
+        self.max_token_limit = max_token_limit
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            memory = self._sessions.pop(session_id, None)
+            if memory is None:
+                memory = SessionSummaryMemory(self.llm, self.max_token_limit)
+            self._sessions[session_id] = memory
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return memory
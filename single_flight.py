@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Runs one call per key at a time; identical concurrent calls share its result.
+
+    For threads (Streamlit sessions, thread pools). The first caller for a key
+    runs `fn`; callers arriving while it is in flight block on it and get the
+    same return value, or the same exception. Nothing is kept once it finishes,
+    so a later call runs again (pair it with a cache for that).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = self._inflight[key] = Future()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+
+class AsyncSingleFlight:
+    """`SingleFlight` for coroutines (FastAPI endpoints, async LLM calls).
+
+    The shared work runs as its own task, so a caller that disconnects or is
+    cancelled does not cancel it for the others still waiting. Calls are only
+    coalesced within one event loop, since a task cannot be awaited from another.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        key = (id(asyncio.get_running_loop()), key)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter was cancelled
+            task.exception()
+
+    def stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
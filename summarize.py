@@ -1,19 +1,50 @@
-from fastapi import FastAPI
-import requests
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
+from llm_clients import gemini_client
+from quota import BATCH, priority
+from summary_pool import ChunkSummary, chunk_messages, summarize_chunks
+from single_flight import AsyncSingleFlight
+from summary_store import SummaryStore, chunk_hash
+from backend_client import BackendClient
 import os
+import asyncio
+import weakref
 from dotenv import load_dotenv
 import uvicorn
 
 # Load environment variables
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled backend client per worker, closed on shutdown
+    app.state.backend = BackendClient()
+    yield
+    await app.state.backend.aclose()
 
+app = FastAPI(lifespan=lifespan)
 
-def summarize_chunk(messages_chunk):
+# Chunk summaries already produced per project, so only new pairs hit Gemini
+summary_store = SummaryStore(os.getenv("SUMMARY_STORE_PATH", os.path.join("bizai_cache", "summary_store.sqlite3")))
+
+# Identical requests in flight at once (frontend retries, several tabs) share one run
+summary_flight = AsyncSingleFlight()
+
+# Runs for the same project save one after another, so the newest messages are saved last
+project_locks = weakref.WeakValueDictionary()
+
+def project_lock(clerk_id, project_id):
+    lock = project_locks.get((clerk_id, project_id))
+    if lock is None:
+        lock = project_locks[(clerk_id, project_id)] = asyncio.Lock()
+    return lock
+
+
+async def summarize_chunk(messages_chunk):
     chat_text = ""
     for msg in messages_chunk:
         role = "User" if msg.get("isUser") else "Assistant"
@@ -24,19 +55,21 @@ You are a helpful AI. Summarize the following short chat exchange in 1-2 sentenc
 
 {chat_text}
 """
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        return f"❌ Error summarizing chunk: {e}"
+    # Summaries are batch work: interactive chat gets the Gemini quota first
+    with priority(BATCH):
+        response = await gemini_model.generate_content_async(prompt)
+    return response.text.strip()
 
 
 @app.put("/summarize_and_save/{clerk_id}/{project_id}")
-def summarize_and_save(clerk_id: str, project_id: str):
+async def summarize_and_save(clerk_id: str, project_id: str, request: Request):
+    return await summarize_and_save_project(clerk_id, project_id, request.app.state.backend)
+
+
+async def summarize_and_save_project(clerk_id, project_id, backend):
     try:
         # Step 1: Fetch chat messages
-        fetch_url = f"http://192.168.1.64:5000/api/v1/chats/{clerk_id}/{project_id}/executive_summary"
-        response = requests.get(fetch_url)
+        response = await backend.get_executive_summary(clerk_id, project_id)
 
         if response.status_code != 200:
             return {"error": f"Failed to fetch data. Status: {response.status_code}"}
@@ -46,40 +79,62 @@ def summarize_and_save(clerk_id: str, project_id: str):
         if not messages:
             return {"summary_chunks": [], "message": "No messages found."}
 
-        # Step 2: Summarize in chunks of 2
-        summary_chunks = []
-        for i in range(0, len(messages), 2):
-            chunk = messages[i:i+2]
-            if chunk:
-                summary = summarize_chunk(chunk)
-                summary_chunks.append(summary)
+        # Every caller reads the chat itself; only callers that saw the same
+        # messages share a run, so one that just saved a message never gets a
+        # summary made before it
+        return await summary_flight.do(
+            ("summarize_and_save", clerk_id, project_id, chunk_hash(messages)),
+            save_project_summary, clerk_id, project_id, messages, backend
+        )
+
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def save_project_summary(clerk_id, project_id, messages, backend):
+    async with project_lock(clerk_id, project_id):
+        # Step 2: Summarize in chunks of 2, only the pairs that are new or changed
+        chunks = chunk_messages(messages, 2)
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        stored = summary_store.load(clerk_id, project_id)
+        pending = {i for i, h in enumerate(hashes) if stored.get(i, (None, None))[0] != h}
+        pending_order = sorted(pending)
+
+        new_summaries = await summarize_chunks([chunks[i] for i in pending_order], summarize_chunk)
+        summaries = {i: ChunkSummary(stored[i][1], True) for i in range(len(chunks)) if i not in pending}
+        summaries.update(zip(pending_order, new_summaries))
+        summary_chunks = [summaries[i].text for i in range(len(chunks))]
+
+        # Failed chunks are stored without a hash so the next call retries them
+        summary_store.save(clerk_id, project_id, [
+            (h if summaries[i].ok else "", summaries[i].text)
+            for i, h in enumerate(hashes)
+        ])
 
         # Step 3: Prepare and send payload to save API via PUT
-        save_url = f"http://192.168.1.64:5000/api/v1/chats/save-type-summary/{clerk_id}/{project_id}/executive_summary"
         save_payload = {
             "content": " ".join(summary_chunks)
         }
 
-        save_response = requests.put(save_url, json=save_payload)
+        save_response = await backend.save_executive_summary(clerk_id, project_id, save_payload["content"])
 
         if save_response.status_code != 200:
             return {
                 "error": f"Failed to save summaries. Status: {save_response.status_code}",
                 "response_text": save_response.text,
                 "request_payload": save_payload,
-                "url": save_url
+                "url": str(save_response.url)
             }
 
         return {
             "project_id": project_id,
             "clerk_id": clerk_id,
             "summary_chunks": summary_chunks,
+            "summarized_chunks": len(pending),
+            "reused_chunks": len(chunks) - len(pending),
             "status": "✅ Summaries saved successfully."
         }
 
-    except Exception as e:
-        return {"error": str(e)}
-
 
 if __name__ == "__main__":
     uvicorn.run("summarize:app", host="0.0.0.0", port=9000, reload=True)
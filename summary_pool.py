@@ -0,0 +1,37 @@
+import os
+import asyncio
+from collections import namedtuple
+
+# How many Gemini chunk calls may run at once, and how long each may take
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "8"))
+SUMMARY_CHUNK_TIMEOUT = float(os.getenv("SUMMARY_CHUNK_TIMEOUT", "30"))
+
+
+# One chunk's summary; `ok` is False when `text` is an error notice instead
+ChunkSummary = namedtuple("ChunkSummary", ["text", "ok"])
+
+
+def chunk_messages(messages, chunk_size=2):
+    return [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+
+
+async def summarize_chunks(chunks, summarize_chunk, concurrency=SUMMARY_CONCURRENCY,
+                           timeout=SUMMARY_CHUNK_TIMEOUT):
+    """Run the async `summarize_chunk` over all chunks with bounded concurrency.
+
+    Returns a `ChunkSummary` per chunk, in the same order as `chunks`. A chunk
+    whose call fails or exceeds `timeout` gets an error notice with ok=False
+    instead of holding up the whole request.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def worker(chunk):
+        async with semaphore:
+            try:
+                return ChunkSummary(await asyncio.wait_for(summarize_chunk(chunk), timeout), True)
+            except asyncio.TimeoutError:
+                return ChunkSummary(f"❌ Error summarizing chunk: timed out after {timeout:g}s", False)
+            except Exception as e:
+                return ChunkSummary(f"❌ Error summarizing chunk: {e}", False)
+
+    return await asyncio.gather(*(worker(chunk) for chunk in chunks))
@@ -0,0 +1,64 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+
+
+def chunk_hash(chunk):
+    """Fingerprint of a message chunk; changes if any message in it is edited or added."""
+    raw = json.dumps(
+        [[bool(msg.get("isUser")), msg.get("content", "")] for msg in chunk],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SummaryStore:
+    """Per-(clerk_id, project_id) chunk summaries, keyed by the hash of each chunk.
+
+    Lets the summarize service only send new or changed chunks to Gemini.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunk_summaries (
+                clerk_id TEXT NOT NULL,
+                project_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                PRIMARY KEY (clerk_id, project_id, chunk_index)
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, clerk_id, project_id):
+        """Stored pieces as {chunk_index: (content_hash, summary)}."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_index, content_hash, summary FROM chunk_summaries "
+                "WHERE clerk_id = ? AND project_id = ?",
+                (clerk_id, project_id)
+            ).fetchall()
+        return {index: (content_hash, summary) for index, content_hash, summary in rows}
+
+    def save(self, clerk_id, project_id, pieces):
+        """Replace the stored pieces with `pieces`, a list of (content_hash, summary) in chunk order."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM chunk_summaries WHERE clerk_id = ? AND project_id = ? AND chunk_index >= ?",
+                (clerk_id, project_id, len(pieces))
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunk_summaries VALUES (?, ?, ?, ?, ?)",
+                [(clerk_id, project_id, i, content_hash, summary)
+                 for i, (content_hash, summary) in enumerate(pieces)]
+            )
+            self._conn.commit()
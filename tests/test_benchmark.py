@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from benchmark import compare, percentiles
+
+
+def test_percentiles_pick_from_the_sorted_samples():
+    stats = percentiles([float(i) for i in range(100, 0, -1)])
+
+    assert stats == {"n": 100, "p50": 51.0, "p95": 96.0, "p99": 100.0}
+
+
+def test_percentiles_of_one_sample():
+    assert percentiles([0.2]) == {"n": 1, "p50": 0.2, "p95": 0.2, "p99": 0.2}
+
+
+def result(p95, throughput):
+    return {"throughput": throughput, "stages": {"end-to-end": {"n": 10, "p50": p95 / 2, "p95": p95, "p99": p95}}}
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"scenarios": {"research": result(1.0, 10.0), "memory": result(0.5, 20.0)}}))
+    return str(path)
+
+
+def test_changes_within_tolerance_pass(baseline):
+    assert compare({"research": result(1.09, 9.1), "memory": result(0.4, 25.0)}, baseline, 0.1) == []
+
+
+def test_slower_p95_is_a_regression(baseline):
+    assert compare({"research": result(1.2, 10.0)}, baseline, 0.1) == ["research"]
+
+
+def test_lower_throughput_is_a_regression(baseline):
+    assert compare({"memory": result(0.5, 17.0)}, baseline, 0.1) == ["memory"]
+
+
+def test_scenarios_missing_from_the_baseline_are_skipped(baseline):
+    assert compare({"analyze": result(9.0, 0.1)}, baseline, 0.1) == []
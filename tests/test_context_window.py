@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field, replace
+
+import pytest
+
+import context_window
+from context_window import ContextWindow, count_tokens
+
+
+@pytest.fixture(autouse=True)
+def char_token_counts(monkeypatch):
+    # The budgets below assume the 4-chars-per-token fallback, with or without tiktoken
+    monkeypatch.setattr(context_window, "encoding", None)
+
+
+@dataclass
+class Message:
+    # The parts of a LangChain message ContextWindow reads
+    type: str
+    content: str
+    id: str = None
+    tool_calls: list = field(default_factory=list)
+
+    def model_copy(self, update):
+        return replace(self, **update)
+
+
+def turn(i, tool_output="x" * 2000):
+    return [
+        Message("human", f"question {i}", id=f"h{i}"),
+        Message("ai", "", id=f"a{i}", tool_calls=[{"name": "serp_search", "id": f"c{i}"}]),
+        Message("tool", tool_output, id=f"t{i}"),
+        Message("ai", f"answer {i}", id=f"r{i}"),
+    ]
+
+
+def test_repeated_message_ids_are_dropped():
+    messages = turn(0) + turn(0)
+    assert ContextWindow(max_tokens=10_000).prepare(messages) == turn(0)
+
+
+def test_older_tool_outputs_are_trimmed_first():
+    window = ContextWindow(max_tokens=1200, keep_tool_outputs=1, tool_preview_chars=100)
+    messages = turn(0) + turn(1) + turn(2)
+
+    prepared = window.prepare(messages)
+
+    tools = [m for m in prepared if m.type == "tool"]
+    assert len(prepared) == len(messages)
+    assert "older tool output trimmed" in tools[0].content
+    assert tools[-1].content == "x" * 2000
+    assert window.total_tokens(prepared) <= 1200
+
+
+def test_oldest_whole_turns_go_when_trimming_is_not_enough():
+    window = ContextWindow(max_tokens=700, keep_tool_outputs=2, tool_preview_chars=100)
+
+    prepared = window.prepare(turn(0) + turn(1) + turn(2))
+
+    # Cut at a human message, never between a tool call and its result
+    assert prepared[0].type == "human"
+    assert [m.id for m in prepared if m.type == "human"] == ["h2"]
+    assert window.total_tokens(prepared) <= 700
+
+
+def test_system_prompt_counts_against_the_budget():
+    window = ContextWindow(max_tokens=1150, keep_tool_outputs=2)
+    messages = turn(0) + turn(1)
+    system = "rules " * 100
+
+    assert window.prepare(messages)[0].id == "h0"
+    prepared = window.prepare(messages, system)
+    assert prepared[0].id == "h1"
+    assert window.total_tokens(prepared) + count_tokens(system) <= 1150
@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.texts = []
+
+    def embed_documents(self, texts):
+        self.texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.texts.append(text)
+        return [float(len(text)), 0.0]
+
+
+@pytest.fixture
+def cached(tmp_path):
+    model = CountingEmbeddings()
+    return model, CachedEmbeddings(model, "test-model", path=str(tmp_path / "embeddings.sqlite3"))
+
+
+def test_only_new_texts_reach_the_model(cached):
+    model, embeddings = cached
+
+    first = embeddings.embed_documents(["a", "bb", "a"])
+    second = embeddings.embed_documents(["bb", "ccc"])
+
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert model.texts == ["a", "bb", "ccc"]
+
+
+def test_queries_and_documents_are_cached_apart(cached):
+    model, embeddings = cached
+
+    embeddings.embed_documents(["a"])
+    assert embeddings.embed_query("a") == [1.0, 0.0]
+    assert model.texts == ["a", "a"]
+
+
+def test_primed_vectors_are_not_embedded_again(cached):
+    model, embeddings = cached
+
+    embeddings.prime(["old turn"], [[0.5, 0.25]])
+
+    assert embeddings.embed_documents(["old turn"]) == [[0.5, 0.25]]
+    assert model.texts == []
+
+
+def test_legacy_embeddings_table_is_dropped(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE embeddings (content_hash TEXT PRIMARY KEY, vector BLOB, last_access REAL)")
+        conn.execute("CREATE INDEX idx_embeddings_last_access ON embeddings(last_access)")
+    conn.close()
+
+    CachedEmbeddings(CountingEmbeddings(), "test-model", path=path)
+
+    with sqlite3.connect(path) as conn:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert "embeddings" not in names
+    assert "idx_embeddings_last_access" not in names
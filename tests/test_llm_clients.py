@@ -0,0 +1,54 @@
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import llm_clients
+from quota import QuotaTimeout
+
+
+class CountingQuota:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def acquire(self, provider, model=None):
+        self.calls += 1
+        if self.fail:
+            raise QuotaTimeout("No openai quota available within 0.1s")
+
+
+def client_with(monkeypatch, quota, handler):
+    monkeypatch.setattr(llm_clients, "quota", quota)
+    monkeypatch.setattr(llm_clients, "backoff_delay", lambda attempt, exc=None: 0)
+    return httpx.Client(transport=llm_clients.RetryingTransport(httpx.MockTransport(handler), retries=3))
+
+
+def test_quota_timeout_fails_after_a_single_wait(monkeypatch):
+    quota = CountingQuota(fail=True)
+    client = client_with(monkeypatch, quota, lambda request: httpx.Response(200))
+
+    with pytest.raises(QuotaTimeout):
+        client.post("https://api.openai.com/v1/chat/completions", json={"model": "gpt-4"})
+    assert quota.calls == 1
+
+
+def test_rate_limited_calls_are_retried_with_quota_each_time(monkeypatch):
+    statuses = [429, 503, 200]
+    quota = CountingQuota()
+    client = client_with(monkeypatch, quota, lambda request: httpx.Response(statuses.pop(0)))
+
+    response = client.post("https://api.openai.com/v1/chat/completions", json={"model": "gpt-4"})
+
+    assert response.status_code == 200
+    assert quota.calls == 3
+
+
+def test_last_error_response_is_returned_when_out_of_retries(monkeypatch):
+    quota = CountingQuota()
+    client = client_with(monkeypatch, quota, lambda request: httpx.Response(429, text="slow down"))
+
+    response = client.post("https://api.openai.com/v1/chat/completions", json={"model": "gpt-4"})
+
+    assert response.status_code == 429
+    assert response.text == "slow down"
+    assert quota.calls == 4
@@ -0,0 +1,35 @@
+from context_window import count_tokens
+from prompt_builder import PromptBuilder, fill, rank, truncate
+
+
+def test_rank_breaks_ties_by_recency_when_asked():
+    candidates = ["alpha", "beta", "gamma"]
+    assert rank("yes", candidates) == [0, 1, 2]
+    assert rank("yes", candidates, prefer_recent=True) == [2, 1, 0]
+
+
+def test_zero_score_query_keeps_the_latest_turns():
+    turns = [f"User: question {i}\nAssistant: answer number {i} " + "filler " * 20 for i in range(10)]
+    budget = count_tokens(turns[0]) * 2 + 2
+    picked, _ = fill("Yes", turns, budget, keep_last=2)
+    assert sorted(picked) == [8, 9]
+
+
+def test_recent_turns_get_room_before_relevant_ones():
+    turns = ["User: pricing for coffee shops\nAssistant: pricing " * 5, "User: ok\nAssistant: sure"]
+    picked, _ = fill("coffee pricing", turns, count_tokens(turns[1]) + 1, keep_last=1)
+    assert list(picked) == [1]
+
+
+def test_oversized_item_is_truncated_to_the_budget_left():
+    text = "market growth report " * 200
+    picked, used = fill("market", [text], 100)
+    assert picked[0].endswith("…")
+    assert used <= 100
+    assert count_tokens(truncate(text, 50)) <= 50
+
+
+def test_build_keeps_the_last_answer_for_a_bare_yes():
+    turns = [f"User: topic {i}\nAssistant: details {i} " + "words " * 60 for i in range(20)]
+    prompt, stats = PromptBuilder(max_tokens=300).build("{search}\n{memory}\n{user_input}", "Yes", [], turns)
+    assert "details 19" in prompt
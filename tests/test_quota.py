@@ -0,0 +1,107 @@
+import time
+import asyncio
+
+import pytest
+
+from quota import BATCH, INTERACTIVE, QuotaScheduler, QuotaTimeout, bucket_limits, priority, current_priority
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    # 60 requests a minute (one a second) with a burst of 2
+    monkeypatch.setenv("QUOTA_TESTPROV_RPM", "60")
+    monkeypatch.setenv("QUOTA_TESTPROV_BURST", "2")
+    return str(tmp_path / "quota.sqlite3")
+
+
+def test_limits_come_from_the_environment_per_model(path, monkeypatch):
+    monkeypatch.setenv("QUOTA_TESTPROV_GPT_4O_MINI_RPM", "6")
+    assert bucket_limits("testprov") == (60.0, 2.0)
+    assert bucket_limits("testprov", "gpt-4o-mini") == (6.0, 2.0)
+
+
+def test_two_connections_share_one_bucket(path):
+    first, second = QuotaScheduler(path), QuotaScheduler(path)
+
+    assert first.try_acquire("testprov") == 0
+    assert second.try_acquire("testprov") == 0
+    # The burst is spent across both; the next token is about a second away
+    wait = first.try_acquire("testprov")
+    assert 0.9 < wait <= 1.0
+    assert second.try_acquire("testprov") > 0
+
+
+def test_models_have_separate_buckets(path):
+    quota = QuotaScheduler(path)
+    quota.try_acquire("testprov", "a")
+    quota.try_acquire("testprov", "a")
+
+    assert quota.try_acquire("testprov", "a") > 0
+    assert quota.try_acquire("testprov", "b") == 0
+
+
+def test_acquire_times_out_after_max_wait(path):
+    quota = QuotaScheduler(path, max_wait=0.2)
+    quota.acquire("testprov")
+    quota.acquire("testprov")
+
+    started = time.monotonic()
+    with pytest.raises(QuotaTimeout, match="within 0.2s"):
+        quota.acquire("testprov")
+    assert time.monotonic() - started < 0.5
+
+
+def test_acquire_waits_for_the_refill(path, monkeypatch):
+    monkeypatch.setenv("QUOTA_TESTPROV_RPM", "600")
+    quota = QuotaScheduler(path, max_wait=2)
+    for _ in range(3):
+        quota.acquire("testprov")
+    assert quota.stats()["testprov"]["tokens"] < 1
+
+
+def test_acquire_async(path):
+    quota = QuotaScheduler(path, max_wait=0.2)
+
+    async def take(n):
+        for _ in range(n):
+            await quota.acquire_async("testprov")
+
+    asyncio.run(take(2))
+    with pytest.raises(QuotaTimeout):
+        asyncio.run(take(1))
+
+
+def test_batch_work_leaves_the_reserve_to_interactive(path, monkeypatch):
+    monkeypatch.setenv("QUOTA_TESTPROV_BURST", "5")
+    quota = QuotaScheduler(path, batch_reserve=0.2)
+
+    taken = 0
+    while quota.try_acquire("testprov", level=BATCH) == 0:
+        taken += 1
+    assert taken == 4
+    assert quota.try_acquire("testprov", level=INTERACTIVE) == 0
+
+
+def test_batch_waits_while_interactive_is_queued(path):
+    first, second = QuotaScheduler(path), QuotaScheduler(path)
+    first.try_acquire("testprov")
+    first.try_acquire("testprov")
+    # An interactive caller in another process is now waiting on the bucket
+    assert first.try_acquire("testprov", level=INTERACTIVE, waiter_id="w1") > 0
+
+    time.sleep(1.1)
+    assert second.try_acquire("testprov", level=BATCH) > 0
+    assert first.try_acquire("testprov", level=INTERACTIVE, waiter_id="w1") == 0
+
+
+def test_disabled_scheduler_never_waits(path):
+    quota = QuotaScheduler(path, enabled=False, max_wait=0)
+    for _ in range(10):
+        quota.acquire("testprov")
+
+
+def test_priority_block_sets_and_restores_the_level():
+    before = current_priority.get()
+    with priority(BATCH):
+        assert current_priority.get() == BATCH
+    assert current_priority.get() == before
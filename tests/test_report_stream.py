@@ -0,0 +1,28 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agents")
+
+import report_stream
+from fake_providers import FakeRunner, LatencyProfile
+
+
+def test_partial_json_string_decodes_an_unfinished_value():
+    assert report_stream.partial_json_string('{"title": "x", "report": "Line one\\nLi', "report") == "Line one\nLi"
+    assert report_stream.partial_json_string('{"title": "x", "rep', "report") is None
+    # An escape split across deltas is held back until it is complete
+    assert report_stream.partial_json_string('{"report": "caf\\u00', "report") == "caf"
+
+
+def test_stream_report_ends_with_the_full_report(monkeypatch):
+    monkeypatch.setattr(FakeRunner, "profile", LatencyProfile("instant"))
+    monkeypatch.setattr(report_stream, "Runner", FakeRunner)
+    shown = []
+
+    result = asyncio.run(report_stream.stream_report(
+        SimpleNamespace(name="Editor Agent", output_type=object), "write it", shown.append
+    ))
+
+    assert shown[-1] == result.final_output.report
@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("agents")
+
+import report_stream
+import research_pipeline
+from fake_providers import FakeRunner, LatencyProfile
+
+
+@pytest.fixture(autouse=True)
+def fake_runner(monkeypatch):
+    monkeypatch.setattr(FakeRunner, "profile", LatencyProfile("instant"))
+    monkeypatch.setattr(FakeRunner, "queries", 3)
+    monkeypatch.setattr(research_pipeline, "Runner", FakeRunner)
+    monkeypatch.setattr(report_stream, "Runner", FakeRunner)
+
+
+def agent(name):
+    return SimpleNamespace(name=name, output_type=object)
+
+
+def test_run_goes_through_every_step_in_order():
+    events = []
+    research = research_pipeline.ResearchRun("coffee shops in Pune")
+
+    async def watched(step):
+        events.append("research started")
+        return await step
+
+    result = asyncio.run(research.run(
+        agent("Triage Agent"), agent("Research Agent"), agent("Editor Agent"), lambda report: None,
+        on_plan=lambda plan: events.append("plan"),
+        watch_research=watched,
+        on_summaries=lambda summaries: events.append("summaries"),
+    ))
+
+    assert events == ["plan", "research started", "summaries"]
+    assert len(research.summaries) == 3
+    assert [s["query"] for s in research.summaries] == research.plan.search_queries
+    assert result is research.report_result
+    assert result.final_output.title == "Benchmark report"
@@ -0,0 +1,55 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from session_memory import SessionSummaryMemory
+
+
+class FailingLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        raise RuntimeError("rate limited")
+
+
+class EchoLLM:
+    def invoke(self, prompt):
+        return SimpleNamespace(content="summary")
+
+
+def wait_idle(memory, timeout=2):
+    deadline = time.monotonic() + timeout
+    while memory.pending is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_failing_llm_is_not_retried_in_a_loop():
+    llm = FailingLLM()
+    memory = SessionSummaryMemory(llm, max_token_limit=1, keep_messages=1)
+    for text in ("first question", "first answer", "second question"):
+        memory.add_user_message(text)
+        wait_idle(memory)
+
+    time.sleep(0.2)
+    # At most one attempt per message added, never a tight resubmit loop
+    assert llm.calls <= 3
+    assert memory.pending is None
+    assert "second question" in memory.context()
+
+
+def test_summary_recovers_after_failure():
+    memory = SessionSummaryMemory(FailingLLM(), max_token_limit=1, keep_messages=1)
+    memory.add_user_message("first question")
+    memory.add_ai_message("first answer")
+    wait_idle(memory)
+
+    memory.llm = EchoLLM()
+    memory.add_user_message("second question")
+    wait_idle(memory)
+    assert memory.summary == "summary"
+    assert memory.messages == ["User: second question"]
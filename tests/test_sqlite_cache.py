@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from sqlite_cache import SQLiteCache, make_key
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache" / "cache.sqlite3")
+
+
+def test_set_then_get_counts_hits_and_misses(path):
+    cache = SQLiteCache(path)
+
+    assert cache.get("k") is None
+    cache.set("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_expired_entries_are_misses(path):
+    cache = SQLiteCache(path)
+    cache.set("k", "value", ttl=0.05)
+    time.sleep(0.1)
+
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(path):
+    cache = SQLiteCache(path, max_entries=2)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_bytes_values_round_trip(path):
+    cache = SQLiteCache(path)
+    cache.set_many({"x": b"\x00\x01\xff", "y": b""})
+
+    assert cache.get_many(["x", "y", "z", "x"]) == {"x": b"\x00\x01\xff", "y": b""}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_filter_by_namespace(path):
+    cache = SQLiteCache(path)
+    cache.set("a", "1", namespace="serpapi")
+    cache.set("b", "2", namespace="tavily")
+
+    assert list(cache.entries("serpapi")) == [("a", "1")]
+    assert sorted(cache.entries()) == [("a", "1"), ("b", "2")]
+
+
+def test_two_processes_share_the_file(path):
+    writer, reader = SQLiteCache(path), SQLiteCache(path)
+    writer.set("k", "value")
+
+    assert reader.get("k") == "value"
+    reader.delete("k")
+    assert writer.get("k") is None
+
+
+def test_make_key_is_stable_and_order_independent_for_dicts():
+    assert make_key("serpapi", {"q": "tea", "n": 5}) == make_key("serpapi", {"n": 5, "q": "tea"})
+    assert make_key("serpapi", "tea") != make_key("tavily", "tea")
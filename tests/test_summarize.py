@@ -0,0 +1,81 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("google.generativeai")
+
+import summarize
+from summary_store import SummaryStore
+
+
+class FakeBackend:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.saved = []
+
+    async def get_executive_summary(self, clerk_id, project_id):
+        data = {"message_Data": {"messages": list(self.messages)}}
+        return SimpleNamespace(status_code=200, json=lambda: data)
+
+    async def save_executive_summary(self, clerk_id, project_id, content):
+        self.saved.append(content)
+        return SimpleNamespace(status_code=200)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(summarize, "summary_store", SummaryStore(str(tmp_path / "summaries.sqlite3")))
+    gate = asyncio.Event()
+    calls = []
+
+    async def summarize_chunk(chunk):
+        calls.append(chunk)
+        await gate.wait()
+        return "+".join(msg["content"] for msg in chunk)
+
+    monkeypatch.setattr(summarize, "summarize_chunk", summarize_chunk)
+    return gate, calls
+
+
+def message(text, user=True):
+    return {"isUser": user, "content": text}
+
+
+def test_a_write_between_overlapping_calls_is_in_the_saved_summary(service):
+    gate, _ = service
+    backend = FakeBackend([message("hi"), message("hello", False)])
+
+    async def scenario():
+        first = asyncio.ensure_future(summarize.summarize_and_save_project("c", "p", backend))
+        await asyncio.sleep(0.05)
+        # The user saves a message while the first summary is still running
+        backend.messages.append(message("new idea"))
+        second = asyncio.ensure_future(summarize.summarize_and_save_project("c", "p", backend))
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+
+    assert first["summary_chunks"] == ["hi+hello"]
+    assert second["summary_chunks"] == ["hi+hello", "new idea"]
+    assert backend.saved[-1] == "hi+hello new idea"
+
+
+def test_identical_overlapping_calls_share_one_run(service):
+    gate, calls = service
+    backend = FakeBackend([message("hi"), message("hello", False)])
+
+    async def scenario():
+        runs = [asyncio.ensure_future(summarize.summarize_and_save_project("c", "p", backend)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*runs)
+
+    results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert len(backend.saved) == 1
+    assert all(r["summary_chunks"] == ["hi+hello"] for r in results)
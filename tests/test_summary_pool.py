@@ -0,0 +1,24 @@
+import asyncio
+
+from summary_pool import chunk_messages, summarize_chunks
+
+
+def test_failures_are_flagged_whatever_the_summary_says():
+    async def summarize(chunk):
+        if chunk == ["boom"]:
+            raise RuntimeError("quota")
+        if chunk == ["slow"]:
+            await asyncio.sleep(1)
+        # A real summary may start like an error notice; it still counts as done
+        return f"❌ Error summarizing chunk: {chunk[0]}"
+
+    results = asyncio.run(summarize_chunks([["ok"], ["boom"], ["slow"]], summarize, timeout=0.1))
+
+    assert [r.ok for r in results] == [True, False, False]
+    assert results[0].text == "❌ Error summarizing chunk: ok"
+    assert results[1].text == "❌ Error summarizing chunk: quota"
+    assert "timed out" in results[2].text
+
+
+def test_chunk_messages_keeps_a_short_tail():
+    assert chunk_messages([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
@@ -0,0 +1,10 @@
+from thread_registry import ThreadRegistry
+
+
+def test_delete_reports_whether_the_thread_existed(tmp_path):
+    registry = ThreadRegistry(str(tmp_path / "threads.sqlite3"), ttl=60)
+    thread_id = registry.create()
+
+    assert registry.delete(thread_id) is True
+    assert registry.delete(thread_id) is False
+    assert registry.get(thread_id) is None
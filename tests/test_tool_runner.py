@@ -0,0 +1,68 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import tool_runner
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(tool_runner, "tool_pool", pool)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def calls(n, name="slow"):
+    return [{"name": name, "id": str(i), "args": {}} for i in range(n)]
+
+
+def test_queue_wait_does_not_count_against_the_timeout(pool, monkeypatch):
+    monkeypatch.setattr(tool_runner, "DEFAULT_TOOL_TIMEOUT", 0.3)
+
+    results = tool_runner.run_tool_calls(calls(3), lambda call: time.sleep(0.2) or "ok")
+
+    assert results == ["ok", "ok", "ok"]
+
+
+def test_slow_tool_times_out(pool, monkeypatch):
+    monkeypatch.setattr(tool_runner, "DEFAULT_TOOL_TIMEOUT", 0.1)
+
+    results = tool_runner.run_tool_calls(calls(1), lambda call: time.sleep(0.3) or "ok")
+
+    assert results[0].startswith("Tool timed out after 0.1s")
+
+
+def test_failing_tool_is_reported(pool):
+    def broken(call):
+        raise RuntimeError("no key")
+
+    assert tool_runner.run_tool_calls(calls(1), broken) == ["Tool failed: no key"]
+
+
+def test_turn_returns_when_the_pool_is_full_of_hung_tools(pool, monkeypatch):
+    monkeypatch.setattr(tool_runner, "DEFAULT_TOOL_TIMEOUT", 0.1)
+    monkeypatch.setattr(tool_runner, "TOOL_QUEUE_TIMEOUT", 0.1)
+    release = threading.Event()
+    ran = []
+
+    def hang(call):
+        ran.append(call["id"])
+        release.wait()
+
+    try:
+        first = tool_runner.run_tool_calls(calls(1), hang)
+        started = time.monotonic()
+        second = tool_runner.run_tool_calls(calls(2), hang)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert first[0].startswith("Tool timed out")
+    assert all(r.startswith("Tool timed out") for r in second)
+    assert elapsed < 1
+    # The queued calls were cancelled, not left to run later
+    pool.shutdown(wait=True)
+    assert ran == ["0"]
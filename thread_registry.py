@@ -0,0 +1,74 @@
+import os
+import time
+import uuid
+import sqlite3
+import threading
+
+
+class ThreadRegistry:
+    """Tracks conversation threads (creation and last use) next to the LangGraph checkpoints.
+
+    Threads idle for longer than `ttl` seconds are treated as gone.
+    """
+
+    def __init__(self, path, ttl):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # Shares the file with the checkpointer's connection; WAL lets one read while the other writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_threads (
+                thread_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def create(self):
+        thread_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT INTO conversation_threads VALUES (?, ?, ?)", (thread_id, now, now))
+            self._conn.commit()
+        return thread_id
+
+    def get(self, thread_id):
+        """Thread info, or None if it does not exist or has expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, last_used FROM conversation_threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+        if row is None or row[1] + self.ttl < time.time():
+            return None
+        return {"thread_id": thread_id, "created_at": row[0], "last_used": row[1],
+                "expires_at": row[1] + self.ttl}
+
+    def touch(self, thread_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE conversation_threads SET last_used = ? WHERE thread_id = ?", (time.time(), thread_id)
+            )
+            self._conn.commit()
+
+    def delete(self, thread_id):
+        """True if the thread existed."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM conversation_threads WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def pop_expired(self):
+        """Remove expired threads and return their ids so their checkpoints can be dropped."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id FROM conversation_threads WHERE last_used < ?", (cutoff,)
+            ).fetchall()
+            self._conn.execute("DELETE FROM conversation_threads WHERE last_used < ?", (cutoff,))
+            self._conn.commit()
+        return [row[0] for row in rows]
@@ -0,0 +1,68 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# Tool calls of one model turn, shared by api.py and search_agent.py
+
+# Tools the model calls per turn (Tavily and SerpAPI)
+TOOLS_PER_TURN = int(os.getenv("TOOLS_PER_TURN", "2"))
+# Enough workers for all of api.py's ANALYZE_WORKERS graph runs to run their tools at once
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", str(int(os.getenv("ANALYZE_WORKERS", "16")) * TOOLS_PER_TURN)))
+tool_pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool")
+
+# Seconds each tool may take, counted from when it starts running, before its
+# result is replaced by a timeout notice
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "20"))
+TOOL_TIMEOUTS = {
+    "serp_search": float(os.getenv("SERPAPI_TIMEOUT", str(DEFAULT_TOOL_TIMEOUT))),
+    "tavily_search_results_json": float(os.getenv("TAVILY_TIMEOUT", str(DEFAULT_TOOL_TIMEOUT))),
+}
+# Seconds a call may wait for a free worker. Timed-out tools keep running and hold
+# their worker, so a full pool must not stall the turn past this plus its tools' timeouts.
+TOOL_QUEUE_TIMEOUT = float(os.getenv("TOOL_QUEUE_TIMEOUT", str(DEFAULT_TOOL_TIMEOUT)))
+
+
+def run_tool_calls(tool_calls, run_tool):
+    """Runs the calls side by side in `tool_pool`; one result string per call, in tool_calls order.
+
+    A tool's own timeout counts from when it starts running. The whole turn,
+    queue wait included, ends at most TOOL_QUEUE_TIMEOUT after the slowest
+    tool's timeout; calls still queued by then are cancelled.
+    """
+    started = [threading.Event() for _ in tool_calls]
+    start_times = [None] * len(tool_calls)
+
+    def timed(i, call):
+        start_times[i] = time.monotonic()
+        started[i].set()
+        return run_tool(call)
+
+    timeouts = [TOOL_TIMEOUTS.get(call['name'], DEFAULT_TOOL_TIMEOUT) for call in tool_calls]
+    deadline = time.monotonic() + TOOL_QUEUE_TIMEOUT + max(timeouts, default=0.0)
+    futures = [tool_pool.submit(timed, i, call) for i, call in enumerate(tool_calls)]
+
+    results = []
+    for i, (future, timeout) in enumerate(zip(futures, timeouts)):
+        try:
+            if not started[i].wait(max(0.0, deadline - time.monotonic())):
+                future.cancel()
+                raise TimeoutError()
+            tool_deadline = min(deadline, start_times[i] + timeout)
+            result = future.result(timeout=max(0.0, tool_deadline - time.monotonic()))
+        except TimeoutError:
+            result = f"Tool timed out after {timeout:g}s, please retry or answer without it."
+        except Exception as e:
+            result = f"Tool failed: {e}"
+        results.append(str(result))
+    return results
+
+
+def execute_tool_calls(tool_calls, run_tool):
+    """`run_tool_calls` as one ToolMessage per call, for the agent graph."""
+    from langchain_core.messages import ToolMessage
+
+    return [
+        ToolMessage(tool_call_id=call['id'], name=call['name'], content=result)
+        for call, result in zip(tool_calls, run_tool_calls(tool_calls, run_tool))
+    ]
@@ -1,11 +1,14 @@
 import os
+import uuid
 import streamlit as st
 from dotenv import load_dotenv
 from langchain_community.utilities import SerpAPIWrapper
 from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain.memory import ConversationSummaryBufferMemory
-from langchain.chat_models import ChatOpenAI
+from search_cache import CachedSearch, run_searches
+from llm_clients import chat_openai, gemini_client
+from session_memory import SessionMemoryManager
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
 
 # Load API keys
 load_dotenv()
@@ -13,15 +16,25 @@ os.environ["SERPAPI_API_KEY"] = os.getenv("SERPAPI_API_KEY")
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Initialize tools
-search_serp = SerpAPIWrapper()
-search_tavily = TavilySearchResults(max_results=4)
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
-
-# LLM required for memory summarization
-llm_memory_model = ChatOpenAI(model_name="gpt-4")
-
-# Initialize memory buffer with LLM
-memory = ConversationSummaryBufferMemory(llm=llm_memory_model, max_token_limit=500)
+search_serp = CachedSearch(SerpAPIWrapper(), "serpapi")
+search_tavily = CachedSearch(TavilySearchResults(max_results=4), "tavily")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
+
+# Per-provider search deadlines in seconds
+SERPAPI_TIMEOUT = float(os.getenv("SERPAPI_TIMEOUT", "8"))
+TAVILY_TIMEOUT = float(os.getenv("TAVILY_TIMEOUT", "8"))
+
+# Prompt text for one provider's result: None means the search failed or timed out
+def search_text(result):
+    if result is None:
+        return "No results (provider unavailable)."
+    return result or "No results."
+
+# One summary memory per browser session; the script reruns on every
+# interaction, so the manager is cached for the life of the process
+@st.cache_resource
+def get_memory_manager():
+    return SessionMemoryManager(chat_openai("gpt-4"), max_token_limit=500)
 
 # Streamlit Web App
 def main():
@@ -33,6 +46,9 @@ def main():
     # Session memory
     if "conversation_history" not in st.session_state:
         st.session_state.conversation_history = []
+    if "memory_session_id" not in st.session_state:
+        st.session_state.memory_session_id = str(uuid.uuid4())
+    memory = get_memory_manager().get(st.session_state.memory_session_id)
 
     # Display past messages
     for pair in st.session_state.conversation_history:
@@ -50,14 +66,18 @@ def main():
             with st.spinner("🔍 Thinking and researching..."):
                 try:
                     # Add user input to memory
-                    memory.chat_memory.add_user_message(user_input)
+                    memory.add_user_message(user_input)
 
-                    # Create memory context from history summary
-                    memory_summary = memory.buffer if memory.buffer else "No prior context."
+                    # Last completed summary plus recent turns; never waits on summarization
+                    memory_summary = memory.context() or "No prior context."
 
-                    # Web search from both tools
-                    serp_result = search_serp.run(user_input)
-                    tavily_result = search_tavily.run(user_input)
+                    # Web search from both tools at once; a slow provider is skipped
+                    search_results = run_searches(user_input, {
+                        "serpapi": (search_serp, SERPAPI_TIMEOUT),
+                        "tavily": (search_tavily, TAVILY_TIMEOUT),
+                    })
+                    serp_result = search_text(search_results["serpapi"])
+                    tavily_result = search_text(search_results["tavily"])
 
                     # Prompt to Gemini
                     prompt = f"""
@@ -87,8 +107,8 @@ Now respond as BizAI in a friendly, structured, and helpful tone. Use bullet poi
                     gemini_response = gemini_model.generate_content(prompt)
                     response_text = gemini_response.text.strip()
 
-                    # Add assistant response to memory
-                    memory.chat_memory.add_ai_message(response_text)
+                    # Add assistant response to memory (summarized in the background)
+                    memory.add_ai_message(response_text)
 
                     final_answer = (
                         f"🤖 **BizAI:**\n\n{response_text}\n\n"
@@ -1,9 +1,10 @@
 import os
 import streamlit as st
 from dotenv import load_dotenv
-from langchain.chat_models import ChatOpenAI
+from llm_clients import chat_openai
 from langchain.agents import initialize_agent, Tool
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
 
 # Load environment variables
 load_dotenv()
@@ -11,7 +12,7 @@ serp_api_key = os.getenv("SERP_API_KEY")
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
 # Initialize SerpAPI
-search = SerpAPIWrapper(serpapi_api_key=serp_api_key)
+search = CachedSearch(SerpAPIWrapper(serpapi_api_key=serp_api_key), "serpapi")
 
 # Define tools
 tools = [
@@ -23,10 +24,10 @@ tools = [
 ]
 
 # Initialize LLM
-llm = ChatOpenAI(
+llm = chat_openai(
+    "gpt-4",
     temperature=0,
-    openai_api_key=openai_api_key,
-    model="gpt-4"
+    openai_api_key=openai_api_key
 )
 
 # Initialize agent
@@ -0,0 +1,113 @@
+import os
+import time
+import threading
+
+from langchain.vectorstores import Chroma
+
+from embedding_backends import (
+    EMBEDDING_BACKEND,
+    get_embedding_backend,
+    read_backend_marker,
+    write_backend_marker,
+)
+
+# One Chroma collection holds every session's memory, told apart by metadata
+SHARED_MEMORY_DIR = os.getenv("SHARED_MEMORY_DIR", "bizai_shared_memory")
+SHARED_COLLECTION = os.getenv("SHARED_MEMORY_COLLECTION", "bizai_sessions")
+# Old one-directory-per-session layout, only read by migrate_sessions.py
+SESSIONS_DIR = os.getenv("BIZAI_SESSIONS_DIR", "bizai_sessions")
+
+
+class SessionVectorStore:
+    """One session's view of the shared collection.
+
+    Offers the parts of the Chroma API memory.py uses; every read is filtered
+    by `session_id` and every write is tagged with it.
+    """
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return self.store.similarity_search(query, k=k, filter={"session_id": self.session_id}, **kwargs)
+
+    def add_texts(self, texts, metadatas=None, **kwargs):
+        # created_at lets compact_memory.py apply TTLs and roll up old turns
+        now = time.time()
+        metadatas = [
+            {"created_at": now, **(m or {}), "session_id": self.session_id}
+            for m in (metadatas or [{} for _ in texts])
+        ]
+        return self.store.add_texts(texts, metadatas=metadatas, **kwargs)
+
+    def add_documents(self, documents, **kwargs):
+        return self.add_texts(
+            [doc.page_content for doc in documents],
+            metadatas=[doc.metadata for doc in documents],
+            **kwargs
+        )
+
+    def get(self, **kwargs):
+        return self.store.get(where={"session_id": self.session_id}, **kwargs)
+
+    def delete(self, ids):
+        return self.store.delete(ids=ids)
+
+
+class VectorStoreRegistry:
+    """Process-wide holder of the embedding client and the shared Chroma collection.
+
+    Streamlit reruns the script on every interaction, but imported modules stay
+    loaded, so the single open handle kept here survives reruns and is shared
+    by every session.
+    """
+
+    def __init__(self, persist_dir=SHARED_MEMORY_DIR, collection=SHARED_COLLECTION, backend=EMBEDDING_BACKEND):
+        self.persist_dir = persist_dir
+        self.collection = collection
+        self.backend = backend
+        self._store = None
+        self._embeddings = None
+        self._lock = threading.RLock()
+
+    @property
+    def embeddings(self):
+        with self._lock:
+            if self._embeddings is None:
+                self._embeddings = get_embedding_backend(self.backend)
+            return self._embeddings
+
+    @property
+    def store(self):
+        with self._lock:
+            if self._store is None:
+                self._check_backend()
+                self._store = Chroma(
+                    collection_name=self.collection,
+                    persist_directory=self.persist_dir,
+                    embedding_function=self.embeddings,
+                )
+            return self._store
+
+    def get(self, session_id):
+        return SessionVectorStore(self.store, session_id)
+
+    def _check_backend(self):
+        if not os.path.isdir(self.persist_dir) or not os.listdir(self.persist_dir):
+            os.makedirs(self.persist_dir, exist_ok=True)
+            write_backend_marker(self.persist_dir, self.backend)
+            return
+        stored = read_backend_marker(self.persist_dir)
+        if stored != self.backend:
+            raise RuntimeError(
+                f"{self.persist_dir} was embedded with the '{stored}' backend but EMBEDDING_BACKEND is "
+                f"'{self.backend}'. Run: python migrate_embeddings.py --backend {self.backend}"
+            )
+
+    def close(self):
+        with self._lock:
+            self._store = None
+
+
+vectorstore_registry = VectorStoreRegistry()
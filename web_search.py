@@ -2,7 +2,11 @@ import os
 import streamlit as st
 from dotenv import load_dotenv
 from langchain_community.utilities import SerpAPIWrapper
+from search_cache import CachedSearch
 import google.generativeai as genai
+from llm_cache import CachedGenerativeModel
+from llm_clients import gemini_client
+from prompt_builder import PromptBuilder, split_snippets
 
 # Load API keys
 load_dotenv()
@@ -10,46 +14,11 @@ os.environ["SERPAPI_API_KEY"] = os.getenv("SERPAPI_API_KEY")
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
 # Initialize tools
-search = SerpAPIWrapper()
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+search = CachedSearch(SerpAPIWrapper(), "serpapi")
+gemini_model = CachedGenerativeModel(gemini_client("gemini-2.0-flash"))
+prompt_builder = PromptBuilder()
 
-# Streamlit Web App
-def main():
-    st.set_page_config(page_title="🌐 BizAI - Business Assistant", layout="wide")
-    st.title("🤖 BizAI - Your Smart Business Planning Assistant")
-
-    st.write("I’ll help you develop your business plan, research your market, and find real insights. Just tell me your idea!")
-
-    # Session memory
-    if "conversation_history" not in st.session_state:
-        st.session_state.conversation_history = []
-  
-    # Display past messages
-    for pair in st.session_state.conversation_history:
-        with st.chat_message("user"):
-            st.markdown(pair["user"])
-        with st.chat_message("assistant"):
-            st.markdown(pair["bot"])
-
-    # New input
-    user_input = st.chat_input("What business idea are you working on?")
-    if user_input:
-        st.chat_message("user").markdown(user_input)
-
-        with st.chat_message("assistant"):
-            with st.spinner("🔍 Thinking and researching..."):
-                try:
-                    # Create memory context from last 5 messages
-                    recent_memory = "\n".join([
-                        f"User: {pair['user']}\nAssistant: {strip_bot(pair['bot'])}"
-                        for pair in st.session_state.conversation_history[-5:]
-                    ])
-
-                    # Web search
-                    serp_result = search.run(user_input)
-
-                    # Prompt to Gemini
-                    prompt = f"""
+PROMPT_TEMPLATE = """
 You are a smart, friendly AI business assistant named "BizAI".
 
 🎯 Your Goal:
@@ -88,26 +57,71 @@ Help the user build a strong business plan by first collecting all essential det
    - Always stay focused unless user clearly switches the topic.
 
 🔎 Web Search Result (for current input):
-{serp_result}
+{search}
 
-🧠 Memory Context (last 5 turns):
-{recent_memory}
+🧠 Memory Context (most relevant earlier turns):
+{memory}
 
 💬 Current User Question:
 User: {user_input}
 
 Now respond as BizAI in a friendly, structured, and helpful tone. Use bullet points and business-style formatting.
-""".strip()
+"""
+
+# One chat turn without the UI: search, build the prompt, ask Gemini
+def answer_turn(user_input, history):
+    # Earlier turns without the BizAI boilerplate; the builder picks which ones fit
+    memory_turns = [
+        f"User: {pair['user']}\nAssistant: {strip_bot(pair['bot'])}"
+        for pair in history
+    ]
+
+    # Web search
+    serp_result = search.run(user_input)
+
+    # Prompt to Gemini, with only the most relevant snippets and turns that fit the budget
+    prompt, _ = prompt_builder.build(
+        PROMPT_TEMPLATE, user_input,
+        snippets=split_snippets(serp_result),
+        turns=memory_turns
+    )
+
+    # Gemini response
+    gemini_response = gemini_model.generate_content(prompt)
+    response_text = gemini_response.text.strip()
+
+    return (
+        f"🤖 **BizAI:**\n\n{response_text}\n\n"
+        "📌 Let me know if you'd like help drafting a section, finding suppliers, or exploring your competition."
+    )
+
+# Streamlit Web App
+def main():
+    st.set_page_config(page_title="🌐 BizAI - Business Assistant", layout="wide")
+    st.title("🤖 BizAI - Your Smart Business Planning Assistant")
 
+    st.write("I’ll help you develop your business plan, research your market, and find real insights. Just tell me your idea!")
+
+    # Session memory
+    if "conversation_history" not in st.session_state:
+        st.session_state.conversation_history = []
+  
+    # Display past messages
+    for pair in st.session_state.conversation_history:
+        with st.chat_message("user"):
+            st.markdown(pair["user"])
+        with st.chat_message("assistant"):
+            st.markdown(pair["bot"])
 
-                    # Gemini response
-                    gemini_response = gemini_model.generate_content(prompt)
-                    response_text = gemini_response.text.strip()
+    # New input
+    user_input = st.chat_input("What business idea are you working on?")
+    if user_input:
+        st.chat_message("user").markdown(user_input)
 
-                    final_answer = (
-                        f"🤖 **BizAI:**\n\n{response_text}\n\n"
-                        "📌 Let me know if you'd like help drafting a section, finding suppliers, or exploring your competition."
-                    )
+        with st.chat_message("assistant"):
+            with st.spinner("🔍 Thinking and researching..."):
+                try:
+                    final_answer = answer_turn(user_input, st.session_state.conversation_history)
 
                     # Show response
                     st.markdown(final_answer)